@@ -4,12 +4,23 @@ Dasa Rsi: The Oracle's Lens (complexity_scorer.py)
 Performs static analysis on source code files to calculate cyclomatic complexity.
 Outputs only the specific 'hotspot' functions and line numbers, preventing Rsi 
 from having to read the entire file line-by-line.
+Given a directory, it scores every source file listed in the shared filesystem
+snapshot (fs_snapshot.py) and reports the worst hotspots across all of them.
 """
 
 import sys
 import os
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fs_snapshot import snapshot  # noqa: E402
+
+SOURCE_EXTENSIONS = {
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".go", ".rs", ".java", ".kt", ".php",
+    ".cs", ".rb", ".c", ".h", ".cpp", ".hpp", ".swift",
+}
+IGNORE_DIRS = {"vendor", "dist", "build", "target"}
+
 def compute_complexity(code_chunk):
     """
     Very naive cyclomatic complexity estimator wrapper.
@@ -50,15 +61,25 @@ def analyze_file(filepath):
             
     return hotspots
 
+def analyze_directory(directory):
+    """Scores every source file in the snapshot under directory; hotspots carry their file path."""
+    snap, under = snapshot(directory)
+    hotspots = []
+    for rel_path, _size, _mtime_ns in snap.iter_files(under, SOURCE_EXTENSIONS, IGNORE_DIRS):
+        for h in analyze_file(os.path.join(directory, rel_path)) or []:
+            h["file"] = rel_path
+            hotspots.append(h)
+    return hotspots
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 complexity_scorer.py <file_path>")
+        print("Usage: python3 complexity_scorer.py <file_path | directory>")
         sys.exit(1)
         
     target_file = sys.argv[1]
     print(f"🛡️  [Dasa Rsi] Analyzing structural complexity of {target_file}...")
     
-    hotspots = analyze_file(target_file)
+    hotspots = analyze_directory(target_file) if os.path.isdir(target_file) else analyze_file(target_file)
     
     if hotspots is None:
         print(f"🔴 [Rsi Lens] File {target_file} not found.")
@@ -73,7 +94,8 @@ def main():
     
     print("\n🔍 HIGH COMPLEXITY HOTSPOTS DETECTED:")
     for h in hotspots[:5]: # Only show top 5 worst offenders
-        print(f"  - Lines {h['line_start']}-{h['line_end']} | Complexity Score: {h['score']} | Context: `{h['preview'][:40]}...`")
+        location = f"{h['file']} " if "file" in h else ""
+        print(f"  - {location}Lines {h['line_start']}-{h['line_end']} | Complexity Score: {h['score']} | Context: `{h['preview'][:40]}...`")
         
     print("\n[Rsi Lens] Recommend running `view_file` exclusively on these line ranges.")
     sys.exit(0)
@@ -4,32 +4,142 @@ Dasa Patih: Zero-Dependency Context Mapper (context_mapper.py)
 Replicates the focused vector mapping of `amdb` and `osgrep` but runs 100% natively.
 Extracts class and function signatures from Python/JS/TS/Go/Rust codebases
 to build highly compressed `.artifacts/context.toon` snippets for the LLM.
+Signatures are cached per file in `.artifacts/cache/context_mapper.json`, so a
+rerun only parses files whose size/mtime (or, failing that, content hash) changed.
+Those files are parsed across a process pool (`--jobs`) and merged in path order.
+
+Every symbol (name, kind, line, enclosing class) is also written to a SQLite index
+at `.artifacts/symbols.db`, so agents can look one up without loading context.toon:
+  python .agent/scripts/context_mapper.py query UserService --kind class
+
+`--budget <tokens>` caps context.toon: files are ranked by `--query` relevance, git
+recency and import fan-in, and signatures are streamed out until the budget is spent.
 """
 
 import sys
 import os
 import re
 import ast
+import math
+import time
+import subprocess
+import json
+import hashlib
+import sqlite3
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def parse_python(filepath: Path):
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fs_snapshot import snapshot  # noqa: E402
+
+# Bump when signature extraction changes so cached signatures are discarded
+CACHE_VERSION = "3"
+
+SOURCE_EXTENSIONS = [".py", ".js", ".ts", ".jsx", ".tsx", ".go", ".rs"]
+IGNORE_DIRS = [".git", "node_modules", "target", "dist", ".gemini", ".artifacts"]
+
+# Below this many files to parse a process pool costs more to start than it saves
+PARALLEL_MIN_FILES = 32
+
+# Per-language symbol extractors: (kind, regex with a `name` and optional `parent` group)
+SYMBOL_PATTERNS = {
+    "js": [
+        ("class", re.compile(r"^\s*(?:export\s+)?(?:default\s+)?class\s+(?P<name>\w+)")),
+        ("function", re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(?P<name>\w+)")),
+        ("function", re.compile(r"^\s*(?:export\s+)?const\s+(?P<name>\w+)\s*=\s*(?:async\s*)?\(.*\)\s*=>")),
+    ],
+    "go": [
+        ("struct", re.compile(r"^\s*type\s+(?P<name>\w+)\s+struct")),
+        ("interface", re.compile(r"^\s*type\s+(?P<name>\w+)\s+interface")),
+        ("method", re.compile(r"^\s*func\s+\(\s*(?:\w+\s+)?\*?(?P<parent>\w+)[^)]*\)\s*(?P<name>\w+)")),
+        ("function", re.compile(r"^\s*func\s+(?P<name>\w+)")),
+    ],
+    "rs": [
+        ("struct", re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?struct\s+(?P<name>\w+)")),
+        ("enum", re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?enum\s+(?P<name>\w+)")),
+        ("trait", re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?trait\s+(?P<name>\w+)")),
+        ("function", re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?(?:unsafe\s+)?fn\s+(?P<name>\w+)")),
+    ],
+}
+SYMBOL_LANGUAGES = {".js": "js", ".jsx": "js", ".ts": "js", ".tsx": "js", ".go": "go", ".rs": "rs"}
+# Import targets per language; only the last path component is kept to match file keys
+IMPORT_PATTERNS = {
+    "js": re.compile(r"""(?:\bfrom\s*|\brequire\s*\(\s*|\bimport\s*\(?\s*)['"]([^'"]+)['"]"""),
+    "go": re.compile(r'^\s*(?:import\s+)?(?:\w+\s+)?"([\w./-]+)"\s*$', re.MULTILINE),
+    "rs": re.compile(r"^\s*(?:pub\s+)?(?:use\s+(?:crate|super|self)::([\w:]+)|mod\s+(\w+)\s*;)", re.MULTILINE),
+}
+# Characters per token used to estimate output size against --budget
+CHARS_PER_TOKEN = 4
+# Commits of history consulted for git recency ranking
+RECENCY_COMMITS = 2000
+
+# Top-level `impl Type {` / `impl Trait for Type {` blocks give Rust functions their parent
+RUST_IMPL = re.compile(r"^impl\b(?:<[^>]*>)?\s+(?:[\w:<>, ]+\s+for\s+)?(?:[\w:]+::)?(?P<name>\w+)")
+
+def python_signatures(tree) -> list:
     signatures = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) or isinstance(node, ast.AsyncFunctionDef):
+            signatures.append(f"def {node.name}(...)")
+        elif isinstance(node, ast.ClassDef):
+            signatures.append(f"class {node.name}")
+    return signatures
+
+def python_symbols(tree) -> list:
+    """Returns [name, kind, line, parent] for every class/function, with dotted parents for nesting."""
+    symbols = []
+
+    def visit(node, parent: str, parent_is_class: bool):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                symbols.append([child.name, "class", child.lineno, parent])
+                visit(child, f"{parent}.{child.name}" if parent else child.name, True)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "method" if parent_is_class else "function"
+                symbols.append([child.name, kind, child.lineno, parent])
+                visit(child, f"{parent}.{child.name}" if parent else child.name, False)
+            else:
+                visit(child, parent, parent_is_class)
+
+    visit(tree, "", False)
+    return symbols
+
+def regex_symbols(content: str, language: str) -> list:
+    symbols = []
+    impl = ""
+    for lineno, line in enumerate(content.splitlines(), 1):
+        if language == "rs":
+            impl_match = RUST_IMPL.match(line)
+            if impl_match:
+                impl = impl_match.group("name")
+                continue
+            if line.startswith("}"):
+                impl = ""
+        for kind, pattern in SYMBOL_PATTERNS[language]:
+            match = pattern.match(line)
+            if match:
+                groups = match.groupdict()
+                parent = groups.get("parent") or ""
+                if language == "rs" and kind == "function" and impl and line[:1].isspace():
+                    kind, parent = "method", impl
+                symbols.append([groups["name"], kind, lineno, parent])
+                break
+    return symbols
+
+def parse_python(filepath: Path, content: str = None):
     try:
-        content = filepath.read_text(encoding="utf-8")
-        tree = ast.parse(content)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) or isinstance(node, ast.AsyncFunctionDef):
-                signatures.append(f"def {node.name}(...)")
-            elif isinstance(node, ast.ClassDef):
-                signatures.append(f"class {node.name}")
+        if content is None:
+            content = filepath.read_text(encoding="utf-8")
+        return python_signatures(ast.parse(content))
     except Exception:
-        pass
-    return signatures
+        return []
 
-def parse_regex(filepath: Path, class_pattern, func_pattern):
+def parse_regex(filepath: Path, class_pattern, func_pattern, content: str = None):
     signatures = []
     try:
-        content = filepath.read_text(encoding="utf-8")
+        if content is None:
+            content = filepath.read_text(encoding="utf-8")
         lines = content.splitlines()
         for line in lines:
             if re.search(class_pattern, line):
@@ -40,51 +150,410 @@ def parse_regex(filepath: Path, class_pattern, func_pattern):
         pass
     return signatures
 
-def parse_file(filepath: Path):
+def parse_file(filepath: Path, content: str = None):
     ext = filepath.suffix
     if ext == ".py":
-        return parse_python(filepath)
+        return parse_python(filepath, content)
     elif ext in [".js", ".ts", ".jsx", ".tsx"]:
-        return parse_regex(filepath, r"^\s*(export\s+)?class\s+\w+", r"^\s*(export\s+)?(async\s+)?function\s+\w+|^\s*(export\s+)?const\s+\w+\s*=\s*\(.*\)\s*=>")
+        return parse_regex(filepath, r"^\s*(export\s+)?class\s+\w+", r"^\s*(export\s+)?(async\s+)?function\s+\w+|^\s*(export\s+)?const\s+\w+\s*=\s*\(.*\)\s*=>", content)
     elif ext == ".go":
-        return parse_regex(filepath, r"^\s*type\s+\w+\s+struct", r"^\s*func\s+")
+        return parse_regex(filepath, r"^\s*type\s+\w+\s+struct", r"^\s*func\s+", content)
     elif ext == ".rs":
-        return parse_regex(filepath, r"^\s*(pub\s+)?(struct|enum|trait)\s+\w+", r"^\s*(pub\s+)?(async\s+)?fn\s+\w+")
+        return parse_regex(filepath, r"^\s*(pub\s+)?(struct|enum|trait)\s+\w+", r"^\s*(pub\s+)?(async\s+)?fn\s+\w+", content)
     return []
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: context_mapper.py <directory>")
+def python_imports(tree) -> list:
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.rsplit(".", 1)[-1] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                names.add(node.module.rsplit(".", 1)[-1])
+            # `from pkg import module` may name modules as well as symbols
+            names.update(alias.name for alias in node.names)
+    return sorted(names)
+
+def regex_imports(content: str, language: str) -> list:
+    names = set()
+    for match in IMPORT_PATTERNS[language].finditer(content):
+        target = next(group for group in match.groups() if group)
+        last = re.split(r"[/:.]+", target.rstrip("/"))
+        last = [part for part in last if part and part not in ("index", "mod")]
+        if last:
+            names.add(last[-1])
+    return sorted(names)
+
+def module_key(rel_path: Path) -> str:
+    """The name other files use to import this one: stem, package dir for Go and index/__init__/mod files."""
+    if rel_path.suffix == ".go" or rel_path.stem in ("__init__", "index", "mod"):
+        return rel_path.parent.name
+    return rel_path.stem
+
+def analyze_file(filepath: Path, content: str) -> tuple:
+    """Returns (signatures, symbols, imports) for one file, parsing Python source only once."""
+    if filepath.suffix == ".py":
+        try:
+            tree = ast.parse(content)
+        except Exception:
+            return [], [], []
+        return python_signatures(tree), python_symbols(tree), python_imports(tree)
+    language = SYMBOL_LANGUAGES.get(filepath.suffix)
+    if not language:
+        return parse_file(filepath, content), [], []
+    return parse_file(filepath, content), regex_symbols(content, language), regex_imports(content, language)
+
+def load_cache(cache_path: Path) -> dict:
+    """Loads rel_path -> [size, mtime_ns, sha1, signatures, symbols, imports] entries from the previous run."""
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+def save_cache(cache_path: Path, entries: dict):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"version": CACHE_VERSION, "files": entries}), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not write signature cache {cache_path}: {e}")
+
+def refresh_entry(filepath: Path, size: int, mtime_ns: int, entry: list) -> tuple:
+    """Hashes a file whose stat changed and parses it unless the content hash still matches."""
+    try:
+        data = filepath.read_bytes()
+    except OSError:
+        return [], None, False
+    digest = hashlib.sha1(data).hexdigest()
+    if entry and entry[0] == size and entry[2] == digest:
+        return entry[3], [size, mtime_ns, digest] + entry[3:], True
+    try:
+        sigs, symbols, imports = analyze_file(filepath, data.decode("utf-8"))
+    except UnicodeDecodeError:
+        sigs, symbols, imports = [], [], []
+    return sigs, [size, mtime_ns, digest, sigs, symbols, imports], False
+
+def _refresh_in_worker(job: tuple) -> tuple:
+    return refresh_entry(*job)
+
+def collect_sources(target_dir: Path) -> list:
+    """Lists source files under target_dir in a stable (sorted) walk order, from the shared filesystem snapshot."""
+    snap, under = snapshot(target_dir)
+    # Exclude typical noise
+    return [target_dir / rel_path for rel_path, _size, _mtime_ns in snap.iter_files(under, SOURCE_EXTENSIONS, IGNORE_DIRS)]
+
+def map_signatures(sources: list, target_dir: Path, cache: dict, jobs: int) -> tuple:
+    """
+    Resolves signatures for every source, in order. Files whose size + mtime match
+    the cache are answered here; the rest are hashed/parsed, fanned out across
+    `jobs` processes in chunked batches when there are enough of them.
+    Returns (results, parsed, reused) where results is [(rel_path, sigs, entry)].
+    """
+    results = []
+    pending = []  # (index in results, refresh_entry args)
+    for filepath in sources:
+        rel_path = filepath.relative_to(target_dir)
+        try:
+            st = filepath.stat()
+        except OSError:
+            continue
+        entry = cache.get(rel_path.as_posix())
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            results.append((rel_path, entry[3], entry))
+            continue
+        pending.append((len(results), (filepath, st.st_size, st.st_mtime_ns, entry)))
+        results.append(None)
+
+    reused = len(results) - len(pending)
+    parsed = 0
+    if jobs > 1 and len(pending) >= PARALLEL_MIN_FILES:
+        chunksize = max(1, min(64, len(pending) // (jobs * 8)))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            refreshed = list(pool.map(_refresh_in_worker, [job for _i, job in pending], chunksize=chunksize))
+    else:
+        refreshed = [refresh_entry(*job) for _i, job in pending]
+    for (index, job), (sigs, entry, hit) in zip(pending, refreshed):
+        if hit:
+            reused += 1
+        else:
+            parsed += 1
+        results[index] = (job[0].relative_to(target_dir), sigs, entry)
+    return results, parsed, reused
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def git_recency(target_dir: Path) -> dict:
+    """
+    Maps rel_path -> recency in (0, 1]: 1 for uncommitted changes, decaying with
+    the age of the last commit that touched the file. Empty outside a git repo.
+    """
+    def git(*args):
+        return subprocess.check_output(["git", *args], cwd=target_dir, stderr=subprocess.DEVNULL).decode("utf-8", "ignore")
+    recency = {}
+    now = time.time()
+    try:
+        log = git("log", f"-n{RECENCY_COMMITS}", "--format=@%ct", "--name-only", "--relative")
+        changed = git("diff", "--name-only", "--relative", "HEAD").splitlines()
+    except (OSError, subprocess.CalledProcessError):
+        return recency
+    for path in changed:
+        recency[path] = 1.0
+    stamp = now
+    for line in log.splitlines():
+        if line.startswith("@"):
+            stamp = int(line[1:])
+        elif line and line not in recency:
+            age_days = max(0.0, now - stamp) / 86400
+            recency[line] = 1.0 / (1.0 + age_days / 7)
+    return recency
+
+def import_fan_in(results: list) -> dict:
+    """Maps rel_path -> number of other files importing it (matched by module key)."""
+    importers = {}
+    for rel_path, _sigs, entry in results:
+        if entry is None:
+            continue
+        for name in entry[5]:
+            importers.setdefault(name, set()).add(rel_path)
+    fan_in = {}
+    for rel_path, _sigs, _entry in results:
+        users = importers.get(module_key(rel_path), set())
+        fan_in[rel_path] = len(users - {rel_path})
+    return fan_in
+
+def rank_files(results: list, recency: dict, fan_in: dict, query_terms: list) -> list:
+    """
+    Orders files with signatures by value: query matches on path or symbol names
+    weigh most, then git recency, then normalized import fan-in. Ties keep path order.
+    """
+    max_fan_in = max(fan_in.values(), default=0)
+    ranked = []
+    for order, (rel_path, sigs, entry) in enumerate(results):
+        if not sigs:
+            continue
+        score = 2.0 * recency.get(rel_path.as_posix(), 0.0)
+        if max_fan_in:
+            score += math.log1p(fan_in.get(rel_path, 0)) / math.log1p(max_fan_in)
+        if query_terms:
+            haystack = rel_path.as_posix().lower() + " " + " ".join(sigs).lower()
+            score += 4.0 * sum(1 for term in query_terms if term in haystack) / len(query_terms)
+        ranked.append((-score, order, rel_path, sigs))
+    ranked.sort(key=lambda item: (item[0], item[1]))
+    return [(rel_path, sigs) for _score, _order, rel_path, sigs in ranked]
+
+def rank_signatures(sigs: list, query_terms: list) -> list:
+    """Query hits first, then classes/types, then public names, keeping source order otherwise."""
+    def key(item):
+        index, sig = item
+        lowered = sig.lower()
+        hit = any(term in lowered for term in query_terms)
+        is_type = bool(re.match(r"(export\s+)?(pub\s+)?(class|struct|enum|trait|type)\b", sig))
+        private = bool(re.search(r"(def|fn|function|func)\s+_", sig))
+        return (not hit, not is_type, private, index)
+    return [sig for _index, sig in sorted(enumerate(sigs), key=key)]
+
+def write_context(out_file: Path, header: str, sections, budget: int = None, query_terms: list = None) -> tuple:
+    """
+    Streams `## path` sections of signatures to out_file. With a token budget the
+    running size estimate decides what fits: a file that does not fit whole keeps
+    its highest ranked signatures, and writing stops once the budget is spent.
+    Returns (files_written, files_omitted, estimated_tokens).
+    """
+    query_terms = query_terms or []
+    written = omitted = 0
+    with open(out_file, "w", encoding="utf-8") as out:
+        out.write(header)
+        used = estimate_tokens(header)
+        for rel_path, sigs in sections:
+            heading = f"\n\n## {rel_path}"
+            if budget is None:
+                out.write(heading + "".join(f"\n- {sig}" for sig in sigs))
+                written += 1
+                continue
+            cost = estimate_tokens(heading)
+            if used + cost >= budget:
+                omitted += 1
+                continue
+            lines = []
+            for sig in rank_signatures(sigs, query_terms):
+                line = f"\n- {sig}"
+                line_cost = estimate_tokens(line)
+                if used + cost + line_cost > budget:
+                    break
+                lines.append(line)
+                cost += line_cost
+            if not lines:
+                omitted += 1
+                continue
+            if len(lines) < len(sigs):
+                lines.append(f"\n- ... {len(sigs) - len(lines)} more signatures")
+            out.write(heading + "".join(lines))
+            used += cost
+            written += 1
+        if omitted:
+            out.write(f"\n\n# ... {omitted} more files omitted to stay within ~{budget} tokens")
+    return written, omitted, used
+
+def open_index(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, sha1 TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS symbols (
+            name TEXT NOT NULL,
+            name_lower TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            file TEXT NOT NULL,
+            line INTEGER NOT NULL,
+            parent TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS symbols_by_name ON symbols (name_lower);
+        CREATE INDEX IF NOT EXISTS symbols_by_file ON symbols (file);
+    """)
+    return conn
+
+def update_index(db_path: Path, results: list) -> int:
+    """
+    Brings the symbol index in line with `results`, rewriting only files whose
+    content hash changed and dropping files that no longer exist. An index written
+    by another CACHE_VERSION (a different extractor) is rebuilt from scratch.
+    Returns the number of files rewritten.
+    """
+    conn = open_index(db_path)
+    with conn:
+        version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None or version[0] != CACHE_VERSION:
+            conn.execute("DELETE FROM symbols")
+            conn.execute("DELETE FROM files")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (CACHE_VERSION,))
+        indexed = dict(conn.execute("SELECT path, sha1 FROM files"))
+        current = set()
+        rewritten = 0
+        for rel_path, _sigs, entry in results:
+            if entry is None:
+                continue
+            path = rel_path.as_posix()
+            current.add(path)
+            if indexed.get(path) == entry[2]:
+                continue
+            conn.execute("DELETE FROM symbols WHERE file = ?", (path,))
+            conn.executemany(
+                "INSERT INTO symbols (name, name_lower, kind, file, line, parent) VALUES (?, ?, ?, ?, ?, ?)",
+                [(name, name.lower(), kind, path, line, parent) for name, kind, line, parent in entry[4]],
+            )
+            conn.execute("INSERT OR REPLACE INTO files (path, sha1) VALUES (?, ?)", (path, entry[2]))
+            rewritten += 1
+        for path in set(indexed) - current:
+            conn.execute("DELETE FROM symbols WHERE file = ?", (path,))
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+    conn.close()
+    return rewritten
+
+def query_index(db_path: Path, query: str, kind: str = None, exact: bool = False, limit: int = 20) -> list:
+    """
+    Looks symbols up by name prefix (or exact name), case-insensitively, using the
+    name index. `Parent.name` restricts matches to members of that parent.
+    Returns (name, kind, file, line, parent) rows.
+    """
+    parent = None
+    if "." in query:
+        parent, query = query.rsplit(".", 1)
+    needle = query.lower()
+    if exact:
+        sql, params = "SELECT name, kind, file, line, parent FROM symbols WHERE name_lower = ?", [needle]
+    else:
+        # Range scan on the index: every string with this prefix sorts between needle and needle + U+FFFF
+        sql = "SELECT name, kind, file, line, parent FROM symbols WHERE name_lower >= ? AND name_lower < ?"
+        params = [needle, needle + "\uffff"]
+    if kind:
+        sql += " AND kind = ?"
+        params.append(kind)
+    if parent:
+        # Suffix compared with substr: LIKE would read `_` and `%` in names as wildcards
+        sql += " AND (parent = ? OR substr(parent, ?) = ?)"
+        params += [parent, -len(parent) - 1, "." + parent]
+    sql += " ORDER BY name_lower = ? DESC, length(name), file, line LIMIT ?"
+    params += [needle, limit]
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+def run_query(argv: list):
+    parser = argparse.ArgumentParser(prog="context_mapper.py query", description="Look up symbols in the index")
+    parser.add_argument("name", help="Symbol name or prefix; use Parent.name to search inside a class/type")
+    parser.add_argument("--dir", default=".", help="Codebase root that was mapped (default: .)")
+    parser.add_argument("--kind", help="Only this kind (class, function, method, struct, enum, trait, interface)")
+    parser.add_argument("--exact", action="store_true", help="Match the whole name instead of a prefix")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results (default: 20)")
+    args = parser.parse_args(argv)
+
+    db_path = Path(args.dir) / ".artifacts" / "symbols.db"
+    if not db_path.exists():
+        print(f"No symbol index at {db_path}. Run: context_mapper.py {args.dir}")
         sys.exit(1)
+    rows = query_index(db_path, args.name, args.kind, args.exact, args.limit)
+    if not rows:
+        print(f"No symbols matching '{args.name}'.")
+        sys.exit(1)
+    for name, kind, file, line, parent in rows:
+        owner = f" (in {parent})" if parent else ""
+        print(f"{kind} {name}{owner} -> {file}:{line}")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        run_query(sys.argv[2:])
+        return
 
-    target_dir = Path(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Dasa Patih codebase context mapper")
+    parser.add_argument("directory", help="Codebase root to map")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for parsing (default: CPU count, 1 = serial)")
+    parser.add_argument("--budget", type=int, metavar="TOKENS",
+                        help="Cap context.toon at roughly this many tokens, most valuable files first")
+    parser.add_argument("--query", default="",
+                        help="With --budget, rank files and signatures matching these words first")
+    args = parser.parse_args()
+
+    target_dir = Path(args.directory)
     if not target_dir.exists() or not target_dir.is_dir():
         print(f"Directory {target_dir} not found.")
         sys.exit(1)
         
     print(f"🗺️ Dasa Patih: Mapping codebase context for {target_dir}...")
     
-    context_lines = [f"# Codebase Context: {target_dir.name}\n"]
-    
-    for root, dirs, files in os.walk(target_dir):
-        # Exclude typical noise
-        dirs[:] = [d for d in dirs if d not in [".git", "node_modules", "target", "dist", ".gemini", ".artifacts"]]
-        for file in files:
-            ext = Path(file).suffix
-            if ext in [".py", ".js", ".ts", ".jsx", ".tsx", ".go", ".rs"]:
-                filepath = Path(root) / file
-                sigs = parse_file(filepath)
-                if sigs:
-                    rel_path = filepath.relative_to(target_dir)
-                    context_lines.append(f"\n## {rel_path}")
-                    for sig in sigs:
-                        context_lines.append(f"- {sig}")
-
     artifacts_dir = target_dir / ".artifacts"
+    cache_path = artifacts_dir / "cache" / "context_mapper.json"
+    cache = load_cache(cache_path)
+    entries = {}
+
+    results, parsed, reused = map_signatures(collect_sources(target_dir), target_dir, cache, args.jobs)
+    for rel_path, sigs, entry in results:
+        if entry is not None:
+            entries[rel_path.as_posix()] = entry
+
     artifacts_dir.mkdir(exist_ok=True)
     out_file = artifacts_dir / "context.toon"
-    
-    out_file.write_text("\n".join(context_lines), encoding="utf-8")
+    header = f"# Codebase Context: {target_dir.name}\n"
+    if args.budget:
+        query_terms = re.findall(r"\w+", args.query.lower())
+        sections = rank_files(results, git_recency(target_dir), import_fan_in(results), query_terms)
+        header += f"# Budget: ~{args.budget} tokens, ranked by query, git recency and import fan-in"
+        written, omitted, used = write_context(out_file, header, sections, args.budget, query_terms)
+        print(f"📏 Budget mode: {written} file(s) in ~{used} tokens, {omitted} omitted")
+    else:
+        write_context(out_file, header, ((rel_path, sigs) for rel_path, sigs, _entry in results if sigs))
+    save_cache(cache_path, entries)
+    rewritten = update_index(artifacts_dir / "symbols.db", results)
+    print(f"🗃️ Parsed {parsed} file(s), reused cached signatures for {reused}")
+    print(f"🔎 Symbol index updated for {rewritten} file(s): {artifacts_dir / 'symbols.db'}")
     print(f"✅ Context successfully compressed into {out_file}")
 
 if __name__ == "__main__":
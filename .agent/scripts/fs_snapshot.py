@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Dasa Patih: Shared Filesystem Snapshot (fs_snapshot.py)
+One listing of the workspace shared by the `.agent/scripts` tools, so an agent
+cycle walks the disk once instead of once per script.
+
+The snapshot records every non-ignored file (path, size, mtime, extension, and a
+SHA-1 computed on demand) and persists it to `.artifacts/cache/fs_snapshot.json`
+at the workspace root (the git top-level when there is one). Inside a git repo
+the file list comes from `git ls-files` (tracked + untracked, honoring
+.gitignore); elsewhere the tree is walked with os.scandir and the root
+.gitignore's patterns are applied. A refresh only re-lists directories whose
+mtime changed and re-stats files; their hash is dropped when size/mtime move.
+
+Usage:
+  python .agent/scripts/fs_snapshot.py [directory]
+"""
+
+import os
+import sys
+import json
+import fnmatch
+import hashlib
+import subprocess
+from pathlib import Path
+
+SNAPSHOT_VERSION = "1"
+SNAPSHOT_PATH = Path(".artifacts") / "cache" / "fs_snapshot.json"
+# Never useful to any script and often huge, whatever .gitignore says
+ALWAYS_IGNORE = {".git", "node_modules", ".artifacts"}
+HASH_BLOCK = 1024 * 1024
+
+def gitignore_patterns(root: Path) -> list:
+    """Patterns of the root .gitignore (negations are not supported and skipped)."""
+    try:
+        lines = (root / ".gitignore").read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+    return [line.strip().strip("/") for line in lines if line.strip() and not line.strip().startswith(("#", "!"))]
+
+def is_ignored(rel_path: str, name: str, patterns: list) -> bool:
+    if name in ALWAYS_IGNORE:
+        return True
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel_path, pattern) for pattern in patterns)
+
+def walk_order(rel_path: str) -> tuple:
+    """Sort key matching a sorted os.walk: a directory's files, then each subdirectory in turn."""
+    parts = rel_path.split("/")
+    return parts[:-1], parts[-1]
+
+def workspace_root(path: Path) -> tuple:
+    """Returns (root, in_git): the git top-level containing path, or path itself outside a repo."""
+    path = Path(path).resolve()
+    cwd = path if path.is_dir() else path.parent
+    try:
+        top = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], cwd=cwd,
+                                      stderr=subprocess.DEVNULL).decode("utf-8").strip()
+        return Path(top), True
+    except (OSError, subprocess.CalledProcessError):
+        return cwd, False
+
+class Snapshot:
+    """
+    files maps rel_path -> [size, mtime_ns, sha1 or None]; dirs maps each
+    non-ignored directory (rel path, "" for the root) to its mtime_ns, empty ones
+    included so files created in them later are noticed.
+    """
+
+    def __init__(self, root: Path, in_git: bool):
+        self.root = root
+        self.in_git = in_git
+        self.files = {}
+        self.dirs = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, root: Path, in_git: bool) -> "Snapshot":
+        snapshot = cls(root, in_git)
+        try:
+            data = json.loads((root / SNAPSHOT_PATH).read_text(encoding="utf-8"))
+            if data.get("version") == SNAPSHOT_VERSION and data.get("git") == in_git:
+                snapshot.files = data["files"]
+                snapshot.dirs = data["dirs"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return snapshot
+
+    def save(self):
+        if not self.dirty:
+            return
+        path = self.root / SNAPSHOT_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        data = {"version": SNAPSHOT_VERSION, "git": self.in_git, "dirs": self.dirs, "files": self.files}
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+    def _stat_dir(self, rel_dir: str):
+        try:
+            return os.stat(self.root / rel_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self) -> int:
+        """Brings the snapshot up to date with the disk. Returns the number of files added, changed or removed."""
+        changed_dirs = [rel_dir for rel_dir, mtime_ns in self.dirs.items() if self._stat_dir(rel_dir) != mtime_ns]
+        # Editing a .gitignore in place leaves directory mtimes alone but changes what is listed
+        relist = not self.dirs or any(
+            rel_path.rsplit("/", 1)[-1] == ".gitignore" and self._changed(rel_path) for rel_path in self.files)
+        before = len(self.files)
+        touched = 0
+        if relist or changed_dirs:
+            if self.in_git:
+                touched += self._list_git()
+            else:
+                touched += self._list_walk([""] if relist else changed_dirs, full=relist)
+        touched += self._restat()
+        # Directory mtimes are re-recorded whenever anything was relisted, even when the
+        # listing itself came out the same (e.g. a new ignored __pycache__ or empty mkdir)
+        if touched or relist or changed_dirs or len(self.files) != before:
+            self.dirty = True
+        return touched
+
+    def _changed(self, rel_path: str) -> bool:
+        try:
+            st = os.stat(self.root / rel_path)
+        except OSError:
+            return True
+        entry = self.files[rel_path]
+        return st.st_size != entry[0] or st.st_mtime_ns != entry[1]
+
+    def _restat(self) -> int:
+        """Re-stats every listed file, dropping vanished ones and hashes of changed ones."""
+        touched = 0
+        for rel_path, entry in list(self.files.items()):
+            try:
+                st = os.stat(self.root / rel_path)
+            except OSError:
+                del self.files[rel_path]
+                touched += 1
+                continue
+            if st.st_size != entry[0] or st.st_mtime_ns != entry[1]:
+                self.files[rel_path] = [st.st_size, st.st_mtime_ns, None]
+                touched += 1
+        return touched
+
+    def _list_git(self) -> int:
+        try:
+            out = subprocess.check_output(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                cwd=self.root, stderr=subprocess.DEVNULL)
+        except (OSError, subprocess.CalledProcessError):
+            self.in_git = False
+            return self._list_walk([""], full=True)
+        listed = set()
+        for rel_path in out.decode("utf-8", "replace").split("\0"):
+            if rel_path and not ALWAYS_IGNORE.intersection(rel_path.split("/")):
+                listed.add(rel_path)
+        touched = len(self.files.keys() ^ listed)
+        for rel_path in self.files.keys() - listed:
+            del self.files[rel_path]
+        for rel_path in listed - self.files.keys():
+            # Size/mtime are filled in by the restat that follows
+            self.files[rel_path] = [-1, -1, None]
+        self.dirs = self._git_dirs()
+        # Every ancestor counts: a new subdirectory only bumps its parent's mtime
+        for rel_path in self.files:
+            rel_dir = rel_path.rpartition("/")[0]
+            while rel_dir not in self.dirs:
+                self.dirs[rel_dir] = self._stat_dir(rel_dir)
+                rel_dir = rel_dir.rpartition("/")[0]
+        return touched
+
+    def _git_dirs(self) -> dict:
+        """
+        Every directory git does not ignore, with its mtime_ns, including ones that
+        hold no listed file yet: a file created there later only bumps their mtime.
+        """
+        try:
+            out = subprocess.check_output(
+                ["git", "ls-files", "-z", "--others", "--ignored", "--exclude-standard", "--directory"],
+                cwd=self.root, stderr=subprocess.DEVNULL)
+            ignored = {rel_path.rstrip("/") for rel_path in out.decode("utf-8", "replace").split("\0") if rel_path}
+        except (OSError, subprocess.CalledProcessError):
+            ignored = set()
+        dirs = {}
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            mtime_ns = self._stat_dir(rel_dir)
+            if mtime_ns is None:
+                continue
+            dirs[rel_dir] = mtime_ns
+            prefix = f"{rel_dir}/" if rel_dir else ""
+            try:
+                with os.scandir(self.root / rel_dir) as it:
+                    for entry in it:
+                        rel_path = prefix + entry.name
+                        if (entry.name not in ALWAYS_IGNORE and rel_path not in ignored
+                                and entry.is_dir(follow_symlinks=False)):
+                            pending.append(rel_path)
+            except OSError:
+                continue
+        return dirs
+
+    def _list_walk(self, rel_dirs: list, full: bool = False) -> int:
+        """Re-lists the given directories with os.scandir, descending only into directories not listed before."""
+        patterns = gitignore_patterns(self.root)
+        touched = 0
+        if full:
+            touched = len(self.files)
+            self.files = {}
+            self.dirs = {}
+        pending = list(rel_dirs)
+        while pending:
+            rel_dir = pending.pop()
+            prefix = f"{rel_dir}/" if rel_dir else ""
+            # Forget what this directory held; anything still there is listed again below
+            for rel_path in [p for p in self.files if p.rpartition("/")[0] == rel_dir]:
+                del self.files[rel_path]
+                touched += 1
+            mtime_ns = self._stat_dir(rel_dir)
+            if mtime_ns is None:
+                for gone in [d for d in self.dirs if d == rel_dir or d.startswith(prefix)]:
+                    del self.dirs[gone]
+                for rel_path in [p for p in self.files if p.startswith(prefix)]:
+                    del self.files[rel_path]
+                    touched += 1
+                continue
+            self.dirs[rel_dir] = mtime_ns
+            try:
+                with os.scandir(self.root / rel_dir) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                rel_path = prefix + entry.name
+                if is_ignored(rel_path, entry.name, patterns):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if rel_path not in self.dirs:
+                            pending.append(rel_path)
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        self.files[rel_path] = [st.st_size, st.st_mtime_ns, None]
+                        touched += 1
+                except OSError:
+                    continue
+        return touched
+
+    def iter_files(self, under: str = "", extensions=None, ignore_dirs=()):
+        """
+        Yields (path, size, mtime_ns) in walk order for files below `under` (relative
+        to the root), with paths relative to `under`. Only extensions in `extensions`
+        (None = any) are kept, and files inside a directory named in `ignore_dirs` are skipped.
+        """
+        prefix = under.strip("/") + "/" if under.strip("/") else ""
+        ignore_dirs = set(ignore_dirs)
+        for rel_path in sorted(self.files, key=walk_order):
+            if prefix and not rel_path.startswith(prefix):
+                continue
+            path = rel_path[len(prefix):]
+            if extensions is not None and os.path.splitext(path)[1] not in extensions:
+                continue
+            if ignore_dirs and ignore_dirs.intersection(path.split("/")[:-1]):
+                continue
+            size, mtime_ns, _digest = self.files[rel_path]
+            yield path, size, mtime_ns
+
+    def digest(self, rel_path: str) -> str:
+        """SHA-1 of a file's content, computed once per size/mtime and kept in the snapshot."""
+        entry = self.files[rel_path]
+        if entry[2] is None:
+            hasher = hashlib.sha1()
+            with open(self.root / rel_path, "rb") as f:
+                for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                    hasher.update(block)
+            entry[2] = hasher.hexdigest()
+            self.dirty = True
+        return entry[2]
+
+def snapshot(path=".") -> tuple:
+    """
+    Loads the persisted snapshot of the workspace containing `path`, refreshes
+    and saves it. Returns (snapshot, under) where `under` is path relative to the
+    snapshot root, ready for iter_files().
+    """
+    path = Path(path).resolve()
+    root, in_git = workspace_root(path)
+    snap = Snapshot.load(root, in_git)
+    snap.refresh()
+    snap.save()
+    under = path.relative_to(root).as_posix() if path != root else ""
+    return snap, "" if under == "." else under
+
+def main():
+    target = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(".")
+    snap, under = snapshot(target)
+    files = list(snap.iter_files(under))
+    print(f"🗂️ Dasa Patih: {len(files)} file(s) in the snapshot of {snap.root} "
+          f"({'git ls-files' if snap.in_git else 'directory walk'}) -> {SNAPSHOT_PATH}")
+
+if __name__ == "__main__":
+    main()
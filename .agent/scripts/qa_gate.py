@@ -4,67 +4,931 @@ Dasa Indra: The native QA Gate (qa_gate.py)
 Assimilates ~800 patterns from `engineering-failures-bible` dynamically.
 Provides native python text scanning against common language-specific pitfalls 
 before a task can be marked complete.
+
+Heuristics are compiled once into a pattern bank. Each regex contributes the
+literal text any match must contain; a single pass over the file buffer finds
+those literals, so only lines that contain one are handed to the full regex.
 """
 
 import sys
 import os
 import re
+import bisect
+import time
+import json
+import hashlib
 import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def load_dynamic_failures(skills_dir: Path) -> dict:
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fs_snapshot import snapshot  # noqa: E402
+
+# Literals shorter than this match almost every line and would only slow the prefilter down
+MIN_LITERAL_LEN = 2
+
+SCAN_EXTENSIONS = [".js", ".ts", ".go", ".rs", ".java", ".php", ".py", ".cpp"]
+IGNORE_DIRS = {".git", "node_modules", "target"}
+
+# Which engineering-failures-<domain> sets apply to a file, by extension
+DOMAIN_ROUTES = {
+    ".cs": ("dotnet",), ".cshtml": ("dotnet",), ".razor": ("dotnet",),
+    ".go": ("go",),
+    ".java": ("java-springboot",), ".kt": ("java-springboot",),
+    ".js": ("nodejs",), ".jsx": ("nodejs",), ".mjs": ("nodejs",), ".cjs": ("nodejs",),
+    ".ts": ("nodejs",), ".tsx": ("nodejs",),
+    ".php": ("php",),
+    ".rs": ("rust",),
+}
+# Interpreter (from a `#!` line) -> domains, for extensionless scripts
+SHEBANG_ROUTES = {"node": ("nodejs",), "deno": ("nodejs",), "bun": ("nodejs",), "ts-node": ("nodejs",), "php": ("php",)}
+# In-file override for mixed-language files, e.g. `<!-- dasa-qa: domains=php,nodejs -->`.
+# It must open a comment line, so strings and docs that merely mention it do not count.
+DOMAIN_MARKER = re.compile(rb"^[ \t]*(?:#|//|/\*|\*|<!--|--|;)[ \t]*dasa-qa:[ \t]*domains=([\w,-]+)", re.MULTILINE)
+# First block read from every file: routing marker, `#!` line and binary sniffing
+SNIFF_BYTES = 8192
+
+# Files above CHUNK_BYTES are streamed and scanned in line-aligned chunks of this size,
+# so peak memory stays flat; files above the max size are not scanned at all.
+CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_FILE_MB = 64
+
+# Pathological-regex guard: a pattern may spend at most this many ms per KB of file
+# (never less than GUARD_MIN_MS) before it is cut off for that file, and after
+# GUARD_STRIKES cut-offs it is disabled for the rest of the run.
+GUARD_MS_PER_KB = 2.0
+GUARD_MIN_MS = 50.0
+GUARD_STRIKES = 3
+PROFILE_REPORT_PATH = Path(".artifacts/qa_profile.toon")
+PREFILTER_KEY = "<literal prefilter>"
+
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_MIN_FILES = 64
+
+# Bump when scanning semantics change so cached findings from older runs are discarded
+SCANNER_VERSION = "1"
+CACHE_PATH = Path(".artifacts/cache/qa_gate.json")
+MAX_CACHE_ENTRIES = 50000
+
+# Bump when the catalog layout or extraction rules change
+CATALOG_VERSION = "2"
+CATALOG_PATH = Path(".artifacts/cache/qa_catalog.json")
+
+def _extract_heuristics(md_file: Path, content: str) -> list:
     """
-    Dynamically parses all knowledge markdown files in the engineering-failures-bible
-    skills to extract regex patterns meant for ripgrep (rg "pattern").
-    Returns a dictionary of domain -> list of (regex, description) tuples.
+    Extracts ripgrep patterns (rg "pattern") from one knowledge file together with
+    the `## ...` section and the `# ...` shell comment that introduce them.
     """
-    failures = {}
-    if not skills_dir.exists():
-        return failures
+    sections, comments = [], []
+    section = comment = ""
+    in_code = False
+    for line in content.split("\n"):
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            comment = ""
+        elif in_code and stripped.startswith("#"):
+            comment = stripped.lstrip("#").strip()
+        elif not in_code and stripped.startswith("## "):
+            section = re.sub(r"\s*\{#[^}]*\}\s*$", "", stripped[3:]).strip()
+            comment = ""
+        sections.append(section)
+        comments.append(comment)
+
+    line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
+    heuristics = []
+    # Extract ripgrep patterns: rg "pattern"
+    # We look for rg followed by space, then " or '
+    for match in re.finditer(r'rg\s+["\']([^"\']+)["\']', content):
+        pattern = match.group(1)
+        idx = bisect.bisect_right(line_starts, match.start()) - 1
+        heading = " — ".join(part for part in (sections[idx], comments[idx]) if part)
+        desc = f"Pattern '{pattern}' found in {md_file.name}"
+        if heading:
+            desc = f"{heading} ('{pattern}' in {md_file.name})"
+        heuristics.append({"pattern": pattern, "desc": desc, "section": sections[idx]})
+    return heuristics
 
-    # Find all knowledge md files
-    for md_file in skills_dir.glob("engineering-failures-*/knowledge/*.md"):
+def _source_state(md_file: Path) -> list:
+    st = md_file.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+def _catalog_is_fresh(catalog: dict, knowledge_files: dict) -> bool:
+    """Checks recorded mtimes/sizes, falling back to content hashes when only mtimes moved."""
+    sources = catalog.get("sources", {})
+    if catalog.get("version") != CATALOG_VERSION or set(sources) != set(knowledge_files):
+        return False
+    for rel, md_file in knowledge_files.items():
+        mtime_ns, size, digest = sources[rel]
+        state = _source_state(md_file)
+        if state == [mtime_ns, size]:
+            continue
+        if state[1] != size or hashlib.sha1(md_file.read_bytes()).hexdigest() != digest:
+            return False
+        sources[rel] = state + [digest]  # touched but unchanged; remember the new mtime
+        catalog["touched"] = True
+    return True
+
+def build_catalog(skills_dir: Path, knowledge_files: dict) -> dict:
+    """Parses every knowledge file into a catalog of heuristics and untranslatable patterns."""
+    catalog = {"version": CATALOG_VERSION, "sources": {}, "heuristics": [], "rejected": []}
+    for rel, md_file in knowledge_files.items():
         domain = md_file.parent.parent.name.replace("engineering-failures-", "")
-        if domain not in failures:
-            failures[domain] = []
-            
         try:
-            content = md_file.read_text(encoding="utf-8")
-            # Extract ripgrep patterns: rg "pattern"
-            # We look for rg followed by space, then " or '
-            matches = re.finditer(r'rg\s+["\']([^"\']+)["\']', content)
-            for match in matches:
-                pattern = match.group(1)
-                # Fallback description since parsing the exact Markdown header is complex
-                desc = f"Pattern '{pattern}' found in {md_file.name}"
-                failures[domain].append((pattern, desc))
-        except Exception as e:
+            data = md_file.read_bytes()
+            content = data.decode("utf-8")
+        except (OSError, UnicodeDecodeError) as e:
             print(f"Warning: Failed to parse {md_file}: {e}")
-            
+            continue
+        catalog["sources"][rel] = _source_state(md_file) + [hashlib.sha1(data).hexdigest()]
+        for heuristic in _extract_heuristics(md_file, content):
+            heuristic.update(domain=domain, source=rel)
+            try:
+                re.compile(heuristic["pattern"])
+            except (re.error, RecursionError, OverflowError) as e:
+                # Some ripgrep syntax does not map 1:1 to python re
+                heuristic["error"] = str(e)
+                catalog["rejected"].append(heuristic)
+                continue
+            literals = required_literals(heuristic["pattern"])
+            heuristic["literals"] = sorted(literals) if literals else None
+            catalog["heuristics"].append(heuristic)
+    return catalog
+
+def load_catalog(skills_dir: Path, catalog_path: Path = CATALOG_PATH) -> dict:
+    """
+    Returns the heuristic catalog, reusing the serialized copy in .artifacts/cache/
+    while the knowledge files it was built from are unchanged.
+    """
+    knowledge_files = {}
+    if skills_dir.exists():
+        for md_file in sorted(skills_dir.glob("engineering-failures-*/knowledge/*.md")):
+            knowledge_files[md_file.relative_to(skills_dir).as_posix()] = md_file
+
+    try:
+        catalog = json.loads(catalog_path.read_text(encoding="utf-8"))
+        if _catalog_is_fresh(catalog, knowledge_files):
+            if not catalog.pop("touched", False):
+                return catalog
+            _write_json(catalog_path, catalog)
+            return catalog
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    catalog = build_catalog(skills_dir, knowledge_files)
+    _write_json(catalog_path, catalog)
+    return catalog
+
+def failures_from_catalog(catalog: dict) -> dict:
+    """Groups catalog heuristics into the domain -> [(regex, description)] form the bank consumes."""
+    failures = {}
+    for heuristic in catalog["heuristics"]:
+        failures.setdefault(heuristic["domain"], []).append((heuristic["pattern"], heuristic["desc"]))
     return failures
 
-def scan_file(filepath: Path, dynamic_failures: dict) -> list:
-    issues = []
+def load_dynamic_failures(skills_dir: Path) -> dict:
+    """
+    Dynamically parses all knowledge markdown files in the engineering-failures-bible
+    skills to extract regex patterns meant for ripgrep (rg "pattern").
+    Returns a dictionary of domain -> list of (regex, description) tuples.
+    """
+    return failures_from_catalog(load_catalog(skills_dir))
+
+def _write_json(path: Path, payload: dict):
+    """Writes JSON atomically so a concurrent reader never sees a half-written cache."""
     try:
-        content = filepath.read_text(encoding="utf-8")
-        lines = content.splitlines()
-        for idx, line in enumerate(lines, 1):
-            for domain, patterns in dynamic_failures.items():
-                for regex_str, desc in patterns:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not write {path}: {e}")
+
+def _best_literals(candidates: list):
+    """Pick the alternative set whose shortest literal is longest (most selective)."""
+    best = None
+    for alts in candidates:
+        if min(len(a) for a in alts) < MIN_LITERAL_LEN:
+            continue
+        key = (min(len(a) for a in alts), -len(alts))
+        if best is None or key > best[0]:
+            best = (key, alts)
+    return best[1] if best else None
+
+# Escapes standing for a character class, an anchor or a named character: never literal text
+NON_LITERAL_ESCAPES = set("dDwWsSbBAZN")
+CONTROL_ESCAPES = {"a": "\a", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+REPEAT_BRACES = re.compile(r"\{(\d*)(?:,(\d*))?\}")
+INLINE_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+
+class _RegexReader:
+    """
+    Minimal reader for the parts of Python regex syntax that decide which literal
+    text a match must contain. Anything it does not model (classes, escapes such as
+    \\d, backreferences, lookarounds) becomes an opaque atom, which only makes the
+    literals it reports fewer, never wrong. Only fed patterns that re.compile accepts.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.pos = 0
+
+    def alternation(self) -> list:
+        """Reads branches up to an unmatched `)` or the end. Each branch is a list of atoms."""
+        branches = [[]]
+        while self.pos < len(self.pattern):
+            ch = self.pattern[self.pos]
+            if ch == ")":
+                break
+            self.pos += 1
+            if ch == "|":
+                branches.append([])
+            elif ch in "*+?{":
+                low = self.repeat(ch)
+                if low is None:
+                    branches[-1].append(("lit", "{"))  # a brace that is not a repeat is literal
+                elif branches[-1]:
+                    branches[-1][-1] = ("repeat", low, branches[-1][-1])
+            else:
+                branches[-1].append(self.atom(ch))
+        return branches
+
+    def repeat(self, ch: str):
+        """Consumes a quantifier whose first char was just read. Returns its minimum, or None for a literal `{`."""
+        if ch == "{":
+            match = REPEAT_BRACES.match(self.pattern, self.pos - 1)
+            if not match or match.group(0) == "{}" or match.group(0) == "{,}":
+                return None
+            self.pos = match.end()
+            low = int(match.group(1) or 0)
+        else:
+            low = 1 if ch == "+" else 0
+        if self.pos < len(self.pattern) and self.pattern[self.pos] in "?+":
+            self.pos += 1  # lazy or possessive
+        return low
+
+    def atom(self, ch: str) -> tuple:
+        if ch == "\\":
+            return self.escape()
+        if ch == "[":
+            self.skip_class()
+            return ("other",)
+        if ch == "(":
+            return self.group()
+        if ch in ".^$":
+            return ("other",)
+        return ("lit", ch)
+
+    def escape(self) -> tuple:
+        ch = self.pattern[self.pos]
+        self.pos += 1
+        if ch in NON_LITERAL_ESCAPES:
+            if ch == "N":
+                self.pos = self.pattern.index("}", self.pos) + 1
+            return ("other",)
+        if ch.isdigit():
+            # Backreference or octal escape
+            self.pos += len(re.match(r"\d{0,2}", self.pattern[self.pos:]).group(0))
+            return ("other",)
+        if ch in "xuU":
+            width = {"x": 2, "u": 4, "U": 8}[ch]
+            code = self.pattern[self.pos:self.pos + width]
+            self.pos += width
+            return ("lit", chr(int(code, 16)))
+        return ("lit", CONTROL_ESCAPES.get(ch, ch))
+
+    def skip_class(self):
+        if self.pattern.startswith("^", self.pos):
+            self.pos += 1
+        if self.pattern.startswith("]", self.pos):
+            self.pos += 1
+        while self.pattern[self.pos] != "]":
+            self.pos += 2 if self.pattern[self.pos] == "\\" else 1
+        self.pos += 1
+
+    def group(self) -> tuple:
+        literal = True
+        if self.pattern.startswith("?", self.pos):
+            self.pos += 1
+            ch = self.pattern[self.pos]
+            if ch == "#":
+                self.pos = self.pattern.index(")", self.pos) + 1
+                return ("skip",)
+            if ch == "P" and self.pattern.startswith("P=", self.pos):
+                self.pos = self.pattern.index(")", self.pos) + 1
+                return ("other",)
+            if ch == "P" or (ch == "<" and self.pattern[self.pos + 1] not in "=!"):
+                self.pos = self.pattern.index(">", self.pos) + 1  # named group
+            elif ch == "(":
+                self.pos = self.pattern.index(")", self.pos) + 1  # conditional: either branch may match
+                literal = False
+            elif ch in "=!<":
+                self.pos += 2 if ch == "<" else 1  # lookaround: matches no text
+                literal = False
+            elif ch in ":>":
+                self.pos += 1
+            else:
+                flags = re.match(r"[aiLmsux]*(?:-[imsx]+)?", self.pattern[self.pos:]).group(0)
+                self.pos += len(flags)
+                if self.pattern[self.pos] == ")":
+                    self.pos += 1
+                    return ("skip",)  # global flags, handled by required_literals()
+                self.pos += 1  # ":" of a scoped flag group
+                added = flags.partition("-")[0]
+                literal = "i" not in added and "x" not in added
+        branches = self.alternation()
+        self.pos += 1  # ")"
+        return ("group", branches) if literal else ("other",)
+
+def _sequence_literals(atoms: list) -> frozenset:
+    """
+    Walks a branch's atoms and returns a set of literals such that every match
+    contains at least one of them, or None when no useful literal exists.
+    """
+    candidates = []
+    run = []
+
+    def flush():
+        if run:
+            candidates.append(frozenset(["".join(run)]))
+            run.clear()
+
+    for atom in atoms:
+        if atom[0] == "skip":
+            continue
+        if atom[0] == "lit" and atom[1] != "\n":  # newline never survives a per-line match
+            run.append(atom[1])
+            continue
+        flush()
+        found = None
+        if atom[0] == "group":
+            found = _alternation_literals(atom[1])
+        elif atom[0] == "repeat" and atom[1] >= 1:
+            found = _sequence_literals([atom[2]])
+        if found:
+            candidates.append(found)
+    flush()
+    return _best_literals(candidates)
+
+def _alternation_literals(branches: list) -> frozenset:
+    alternatives = [_sequence_literals(branch) for branch in branches]
+    if not all(alternatives):
+        return None
+    return _best_literals([frozenset().union(*alternatives)])
+
+def required_literals(regex_str: str):
+    """Returns the literals one of which must occur in any match of regex_str, or None."""
+    try:
+        re.compile(regex_str)
+    except (re.error, RecursionError, OverflowError):
+        return None
+    for flags in INLINE_FLAGS.findall(regex_str):
+        if "i" in flags or "x" in flags:
+            return None
+    try:
+        reader = _RegexReader(regex_str)
+        branches = reader.alternation()
+    except (ValueError, IndexError):
+        return None
+    return _alternation_literals(branches)
+
+def _trie_regex(words) -> str:
+    """Builds a regex from a trie of words so alternation never backtracks across siblings."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node) -> str:
+        branches = []
+        optional = "" in node
+        for ch in sorted(k for k in node if k):
+            branches.append(re.escape(ch) + render(node[ch]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if optional else body
+
+    return render(trie)
+
+class PatternBank:
+    """
+    Compiled heuristic set. Regexes are compiled on first use; invalid patterns are
+    dropped then and listed in `rejected` as (domain, pattern, error) tuples.
+    `literals` may supply precomputed prefilter literals per pattern (as stored in
+    the catalog). `domains` restricts which heuristics are compiled and matched,
+    while heuristic indices stay global so hits from any sub-bank format the same.
+    """
+
+    def __init__(self, dynamic_failures: dict, literals: dict = None, domains: tuple = None):
+        self.dynamic_failures = dynamic_failures
+        self.literals = literals
+        self.domains = domains
+        self.heuristics = []   # (domain, desc) in load order, used for stable reporting
+        self.rejected = []
+        self.compiled = False
+        self.sub_banks = {}    # domains -> PatternBank, built on demand by for_domains()
+        self.guard_ms_per_kb = GUARD_MS_PER_KB  # None disables the guard
+        self.strikes = {}      # pattern -> times the guard cut it off
+        self.disabled = set()  # patterns switched off after GUARD_STRIKES cut-offs
+        hasher = hashlib.sha1(SCANNER_VERSION.encode())
+        for domain, patterns in dynamic_failures.items():
+            for regex_str, desc in patterns:
+                hasher.update(f"{domain}\0{regex_str}\0{desc}\n".encode())
+                self.heuristics.append((domain, desc))
+        # Identifies this exact heuristic set; cached findings are only valid for the same fingerprint
+        self.fingerprint = hasher.hexdigest()
+
+    def __len__(self):
+        return len(self.heuristics)
+
+    def __getstate__(self):
+        # Workers receive the uncompiled bank and compile the sub-banks they actually need
+        state = dict(self.__dict__)
+        state["sub_banks"] = {}
+        if self.compiled:
+            for key in ("regexes", "owners", "literal_index", "unfiltered", "multiline", "prefixes", "prefilter"):
+                state.pop(key)
+            state["compiled"] = False
+            state["rejected"] = []
+        return state
+
+    def for_domains(self, domains: tuple) -> "PatternBank":
+        """Returns the bank restricted to `domains` (None = every domain)."""
+        if domains is None:
+            return self
+        if domains not in self.sub_banks:
+            sub_bank = PatternBank(self.dynamic_failures, self.literals, domains)
+            sub_bank.guard_ms_per_kb = self.guard_ms_per_kb
+            self.sub_banks[domains] = sub_bank
+        return self.sub_banks[domains]
+
+    def _compile(self):
+        self.regexes = {}      # pattern -> compiled regex (shared by duplicate heuristics)
+        self.owners = {}       # pattern -> [heuristic index]
+        self.literal_index = {}  # literal -> [pattern]
+        self.unfiltered = []   # patterns that must run against the whole buffer
+        self.rejected = []
+        index = -1
+        for domain, patterns in self.dynamic_failures.items():
+            for regex_str, _desc in patterns:
+                index += 1
+                if self.domains is not None and domain not in self.domains:
+                    continue
+                if regex_str not in self.regexes:
                     try:
-                        if re.search(regex_str, line):
-                            issues.append(f"[FAIL] {domain} | {filepath.name}:{idx} -> {desc}")
-                    except re.error:
-                        # Some ripgrep syntax might not map 1:1 to python re, ignore broken ones
-                        pass
-    except Exception:
-        pass # Skip unreadable or binary files safely
+                        self.regexes[regex_str] = re.compile(regex_str)
+                    except (re.error, RecursionError, OverflowError) as e:
+                        # Some ripgrep syntax does not map 1:1 to python re
+                        self.rejected.append((domain, regex_str, str(e)))
+                        self.regexes[regex_str] = None
+                        continue
+                    self.owners[regex_str] = []
+                    if self.literals is not None and regex_str in self.literals:
+                        pattern_literals = self.literals[regex_str]
+                    else:
+                        pattern_literals = required_literals(regex_str)
+                    if pattern_literals:
+                        for literal in pattern_literals:
+                            self.literal_index.setdefault(literal, []).append(regex_str)
+                    else:
+                        self.unfiltered.append(regex_str)
+                if self.regexes[regex_str] is not None:
+                    self.owners[regex_str].append(index)
+
+        self.multiline = {p: re.compile(p, re.MULTILINE) for p in self.unfiltered}
+        # Every literal that is a prefix of another, so one longest match yields all hits at a position
+        self.prefixes = {
+            lit: [lit[:k] for k in range(MIN_LITERAL_LEN, len(lit) + 1) if lit[:k] in self.literal_index]
+            for lit in self.literal_index
+        }
+        self.prefilter = None
+        if self.literal_index:
+            self.prefilter = re.compile("(?=(" + _trie_regex(self.literal_index) + "))")
+        self.compiled = True
+
+    def scan(self, text: str, profile: dict = None, guarded: list = None) -> list:
+        """
+        Returns sorted (line_number, heuristic_index) hits for a whole file buffer.
+        When `profile` is a dict, per-pattern [seconds, evaluations, hits, bytes] are
+        accumulated into it. Patterns the cost guard cut off or disabled for this
+        buffer are appended to `guarded`, so callers know the result is partial.
+        """
+        if not self.compiled:
+            self._compile()
+        newlines = None
+        hits = set()
+        budget = None
+        if self.guard_ms_per_kb is not None:
+            budget = max(GUARD_MIN_MS, self.guard_ms_per_kb * len(text) / 1024) / 1000
+
+        def line_of(offset: int) -> int:
+            nonlocal newlines
+            if newlines is None:
+                newlines = [m.start() for m in re.finditer("\n", text)]
+            return bisect.bisect_left(newlines, offset) + 1
+
+        def line_text(lineno: int) -> str:
+            start = newlines[lineno - 2] + 1 if lineno > 1 else 0
+            end = newlines[lineno - 1] if lineno - 1 < len(newlines) else len(text)
+            return text[start:end]
+
+        def run(regex_str: str, attempts):
+            """Drains (lineno, matched, bytes) attempts for one pattern under the cost guard."""
+            if regex_str in self.disabled:
+                if guarded is not None:
+                    guarded.append(regex_str)
+                return
+            started = time.perf_counter()
+            evaluations = matched_count = scanned = 0
+            for lineno, matched, size in attempts:
+                evaluations += 1
+                scanned += size
+                if matched:
+                    matched_count += 1
+                    for owner in self.owners[regex_str]:
+                        hits.add((lineno, owner))
+                # Python's re cannot be interrupted, so the guard stops a pattern between lines
+                if budget is not None and time.perf_counter() - started > budget:
+                    self.strikes[regex_str] = self.strikes.get(regex_str, 0) + 1
+                    if self.strikes[regex_str] >= GUARD_STRIKES:
+                        self.disabled.add(regex_str)
+                    if guarded is not None:
+                        guarded.append(regex_str)
+                    break
+            if profile is not None:
+                stats = profile.setdefault(regex_str, [0.0, 0, 0, 0])
+                stats[0] += time.perf_counter() - started
+                stats[1] += evaluations
+                stats[2] += matched_count
+                stats[3] += scanned
+
+        def candidate_attempts(regex, lines):
+            for lineno in sorted(lines):
+                line = line_text(lineno)
+                yield lineno, regex.search(line) is not None, len(line) + 1
+
+        def buffer_attempts(regex, multiline):
+            # Search the buffer, then confirm the hit on its own line so results keep per-line
+            # semantics even when a regex like \s* could otherwise run across a newline.
+            pos = 0
+            while pos < len(text):
+                match = multiline.search(text, pos)
+                if not match:
+                    yield None, False, len(text) - pos
+                    return
+                lineno = line_of(match.start())
+                next_newline = text.find("\n", match.start())
+                end = len(text) if next_newline == -1 else next_newline + 1
+                yield lineno, regex.search(line_text(lineno)) is not None, end - pos
+                pos = end
+
+        if self.prefilter is not None:
+            started = time.perf_counter()
+            candidates = {}  # pattern -> candidate line numbers
+            for match in self.prefilter.finditer(text):
+                lineno = line_of(match.start())
+                for literal in self.prefixes[match.group(1)]:
+                    for regex_str in self.literal_index[literal]:
+                        candidates.setdefault(regex_str, set()).add(lineno)
+            if profile is not None:
+                stats = profile.setdefault(PREFILTER_KEY, [0.0, 0, 0, 0])
+                stats[0] += time.perf_counter() - started
+                stats[1] += 1
+                stats[3] += len(text)
+            for regex_str, lines in candidates.items():
+                run(regex_str, candidate_attempts(self.regexes[regex_str], lines))
+
+        for regex_str in self.unfiltered:
+            run(regex_str, buffer_attempts(self.regexes[regex_str], self.multiline[regex_str]))
+
+        return sorted(hits)
+
+def route_domains(filepath: Path, head: bytes, routes: dict) -> tuple:
+    """
+    Picks the domains whose heuristics apply to a file: an in-file `dasa-qa: domains=`
+    comment wins, then the extension table, then the `#!` interpreter. `routes=None`
+    (--all-domains) disables routing, markers included, and applies every domain.
+    """
+    if routes is None:
+        return None
+    marker = DOMAIN_MARKER.search(head)
+    if marker:
+        return tuple(sorted({d for d in marker.group(1).decode("ascii").split(",") if d}))
+    if filepath.suffix in routes:
+        return routes[filepath.suffix]
+    if head.startswith(b"#!"):
+        words = head[2:].split(b"\n", 1)[0].decode("utf-8", "ignore").split()
+        if words and os.path.basename(words[0]) == "env":
+            words = [w for w in words[1:] if not w.startswith("-")]
+        if words:
+            interpreter = re.match(r"[a-z-]*", os.path.basename(words[0])).group(0)
+            return SHEBANG_ROUTES.get(interpreter, ())
+    return ()
+
+def looks_binary(head: bytes) -> bool:
+    """Cheap sniff of the first block: NUL bytes or invalid UTF-8 mean the file is not source."""
+    if b"\0" in head:
+        return True
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the block boundary is fine
+        return e.start < len(head) - 3
+    return False
+
+def _decode(data: bytes) -> str:
+    # Match read_text()'s universal newline handling
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+def _split_chunk(block: bytes, final: bool) -> int:
+    """Where to cut a block: after its last newline, else (one enormous line) at a UTF-8 boundary."""
+    if final:
+        return len(block)
+    newline = block.rfind(b"\n")
+    if newline != -1:
+        return newline + 1
+    # One enormous line (minified bundle): split it, backing off continuation bytes
+    end = len(block)
+    while end > 0 and block[end - 1] & 0xC0 == 0x80 and len(block) - end < 3:
+        end -= 1
+    if end > 0 and block[end - 1] >= 0xC0:
+        end -= 1  # lead byte of the character that was cut
+    return end
+
+def file_digest(f) -> str:
+    """SHA-1 of an open binary file, read in CHUNK_BYTES blocks."""
+    hasher = hashlib.sha1()
+    for block in iter(lambda: f.read(CHUNK_BYTES), b""):
+        hasher.update(block)
+    return hasher.hexdigest()
+
+def scan_stream(f, bank: PatternBank, stats: dict, guarded: list) -> list:
+    """
+    Scans an open binary file one chunk at a time. Chunks end on a newline, so
+    per-line matching is unaffected; only lines longer than CHUNK_BYTES are split.
+    """
+    hits = set()
+    line_base = 0
+    carry = b""
+    while True:
+        block = f.read(CHUNK_BYTES)
+        final = not block
+        block = carry + block
+        if not block:
+            break
+        cut = _split_chunk(block, final)
+        content, carry = _decode(block[:cut]), block[cut:]
+        for lineno, owner in bank.scan(content, stats, guarded):
+            hits.add((line_base + lineno, owner))
+        # A chunk that stops mid-line continues that same line in the next chunk
+        line_base += content.count("\n")
+        if final:
+            break
+    return sorted(hits)
+
+def file_hits(filepath: Path, bank: PatternBank, known: dict = None, routes: dict = None,
+              profile: bool = False) -> tuple:
+    """
+    Returns (cache_key, hits, guarded, profile) for a file, scanning only the domains
+    it routes to. The key combines the content digest with those domains; when
+    `known` already holds findings for it they are reused instead of rescanning.
+    `guarded` lists patterns the cost guard cut short, and `profile` holds
+    per-pattern stats when profiling. Unreadable, binary and files that route to
+    no domain return a None key. Files larger than CHUNK_BYTES are hashed and
+    scanned in streamed chunks and never held in memory as a whole.
+    """
+    stats = {} if profile else None
+    guarded = []
+    try:
+        with open(filepath, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+            domains = route_domains(filepath, head, routes)
+            if domains == () or looks_binary(head):
+                return None, [], [], None
+            key_suffix = ":" + ("+".join(domains) if domains is not None else "*")
+            size = os.fstat(f.fileno()).st_size
+            if size <= CHUNK_BYTES:
+                data = head + f.read()
+                digest = hashlib.sha1(data).hexdigest() + key_suffix
+                if known and digest in known:
+                    return digest, known[digest], [], None
+                content = _decode(data)
+                hits = bank.for_domains(domains).scan(content, stats, guarded)
+            else:
+                f.seek(0)
+                digest = file_digest(f) + key_suffix
+                if known and digest in known:
+                    return digest, known[digest], [], None
+                f.seek(0)
+                hits = scan_stream(f, bank.for_domains(domains), stats, guarded)
+    except OSError:
+        return None, [], [], None
+    except UnicodeDecodeError:
+        return None, [], [], None # Binary content past the sniffed block
+    return digest, [list(hit) for hit in hits], guarded, stats
+
+def format_issues(filepath: Path, bank: PatternBank, hits: list) -> list:
+    issues = []
+    for idx, owner in hits:
+        domain, desc = bank.heuristics[owner]
+        issues.append(f"[FAIL] {domain} | {filepath.name}:{idx} -> {desc}")
     return issues
 
+def scan_file(filepath: Path, bank: PatternBank, routes: dict = DOMAIN_ROUTES) -> list:
+    _digest, hits, _guarded, _stats = file_hits(filepath, bank, routes=routes)
+    return format_issues(filepath, bank, hits)
+
+def load_cache(bank: PatternBank) -> dict:
+    """Loads content-digest -> hits findings recorded for this exact heuristic set."""
+    try:
+        cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("fingerprint") != bank.fingerprint:
+        return {}
+    return cache.get("entries", {})
+
+def save_cache(bank: PatternBank, entries: dict):
+    # Entries are kept in least-recently-used order; trim the oldest beyond the cap
+    if len(entries) > MAX_CACHE_ENTRIES:
+        entries = dict(list(entries.items())[-MAX_CACHE_ENTRIES:])
+    _write_json(CACHE_PATH, {"fingerprint": bank.fingerprint, "entries": entries})
+
+_worker_bank = None
+_worker_known = None
+_worker_routes = None
+_worker_profile = False
+
+def _init_worker(bank: PatternBank, known: dict, routes: dict, profile: bool):
+    """Receives the bank, cache and routing table once per worker process instead of once per file."""
+    global _worker_bank, _worker_known, _worker_routes, _worker_profile
+    _worker_bank = bank
+    _worker_known = known
+    _worker_routes = routes
+    _worker_profile = profile
+
+def _scan_in_worker(filepath: Path) -> tuple:
+    return file_hits(filepath, _worker_bank, _worker_known, _worker_routes, _worker_profile)
+
+def is_candidate(path: Path, routes: dict) -> bool:
+    """Files worth opening: routed extensions, the legacy scan set, and executable scripts (for `#!`)."""
+    if path.suffix in SCAN_EXTENSIONS or (routes and path.suffix in routes):
+        return True
+    return path.suffix == "" and os.access(path, os.X_OK)
+
+def git_changed_files(target_path: Path, since: str = None, routes: dict = DOMAIN_ROUTES) -> list:
+    """
+    Lists files under target_path that git reports as changed: staged, unstaged and
+    untracked by default, or everything that differs from `since` when a ref is given.
+    Returns None when git is unavailable or the target is not inside a repository.
+    """
+    cwd = target_path if target_path.is_dir() else target_path.parent
+    def git(*args):
+        return subprocess.check_output(["git", *args], cwd=cwd, stderr=subprocess.DEVNULL).decode("utf-8", "replace")
+    try:
+        top = Path(git("rev-parse", "--show-toplevel").strip())
+        # -z keeps paths git would otherwise quote (non-ASCII, special characters) verbatim
+        if since:
+            names = git("diff", "--name-only", "-z", since).split("\0")
+        else:
+            names = git("diff", "--name-only", "-z", "--cached").split("\0")
+            names += git("diff", "--name-only", "-z").split("\0")
+            names += [str((cwd / n).resolve().relative_to(top))
+                      for n in git("ls-files", "-z", "--others", "--exclude-standard").split("\0") if n]
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+    target = target_path.resolve()
+    changed = set()
+    for name in names:
+        path = top / name
+        if not name or not path.is_file() or not is_candidate(path, routes):
+            continue  # deleted or out-of-scope files
+        if path == target or target in path.parents:
+            changed.add(path)
+    return sorted(changed)
+
+def collect_targets(target_path: Path, routes: dict = DOMAIN_ROUTES) -> list:
+    """
+    Lists the files the gate should scan, in a stable order, from the shared filesystem
+    snapshot. A directory the snapshot leaves out (gitignored, e.g. `build/`) was asked
+    for explicitly, so it is walked directly rather than reported as empty.
+    """
+    if target_path.is_file():
+        return [target_path]
+    snap, under = snapshot(target_path)
+    if under not in snap.dirs:
+        return walk_targets(target_path, routes)
+    targets = []
+    for rel_path, _size, _mtime_ns in snap.iter_files(under, ignore_dirs=IGNORE_DIRS):
+        path = target_path / rel_path
+        if is_candidate(path, routes):
+            targets.append(path)
+    return targets
+
+def walk_targets(target_path: Path, routes: dict = DOMAIN_ROUTES) -> list:
+    """Lists candidate files under a directory with os.walk, skipping only IGNORE_DIRS."""
+    targets = []
+    for root, dirs, files in os.walk(target_path):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORE_DIRS)
+        for name in sorted(files):
+            path = Path(root) / name
+            if is_candidate(path, routes):
+                targets.append(path)
+    return targets
+
+def scan_files(targets: list, bank: PatternBank, jobs: int, known: dict = None, routes: dict = DOMAIN_ROUTES,
+               profile: bool = False):
+    """
+    Yields file_hits() results per file in the order of `targets`, fanning out to
+    `jobs` processes. Files whose key is in `known` reuse the cached hits.
+    """
+    if jobs <= 1 or len(targets) < PARALLEL_MIN_FILES:
+        for filepath in targets:
+            yield file_hits(filepath, bank, known, routes, profile)
+        return
+    chunksize = max(1, min(64, len(targets) // (jobs * 8)))
+    initargs = (bank, known, routes, profile)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        yield from pool.map(_scan_in_worker, targets, chunksize=chunksize)
+
+def write_profile_report(profile: dict, bank: PatternBank, guard_hits: dict, files: int,
+                         path: Path = PROFILE_REPORT_PATH, limit: int = 100):
+    """Writes per-pattern cost, ranked by total match time, as a TOON report."""
+    domains_of = {}
+    for domain, patterns in bank.dynamic_failures.items():
+        for regex_str, _desc in patterns:
+            domains_of.setdefault(regex_str, set()).add(domain)
+    ranked = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)
+    total = sum(stats[0] for _p, stats in ranked) or 1e-9
+    lines = [
+        "# QA Gate Pattern Profile",
+        f"Files: {files}",
+        f"Patterns: {len(ranked)}",
+        f"Total match time: {total * 1000:.1f} ms",
+        f"Guard: {bank.guard_ms_per_kb} ms/KB (min {GUARD_MIN_MS:.0f} ms per file, disabled after {GUARD_STRIKES} cut-offs)",
+        "",
+        "## Ranked Patterns",
+        "rank | ms | share | ms/KB | evaluated | hits | KB | guard | domains | pattern",
+    ]
+    for rank, (regex_str, (seconds, evaluations, matched, scanned)) in enumerate(ranked[:limit], 1):
+        kb = scanned / 1024
+        per_kb = seconds * 1000 / kb if kb else 0.0
+        domains = ",".join(sorted(domains_of.get(regex_str, ()))) or "-"
+        lines.append(
+            f"{rank} | {seconds * 1000:.2f} | {seconds / total:.1%} | {per_kb:.3f} | {evaluations} | "
+            f"{matched} | {kb:.1f} | {guard_hits.get(regex_str, 0)} | {domains} | {regex_str}"
+        )
+    if len(ranked) > limit:
+        lines.append(f"... {len(ranked) - limit} more patterns")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+def report_rejected(rejected: list, limit: int = 10):
+    if not rejected:
+        return
+    print(f"⚠️ Dropped {len(rejected)} heuristics that do not compile as Python regex (see {CATALOG_PATH}):")
+    for heuristic in rejected[:limit]:
+        print(f"   - {heuristic['source']} | {heuristic['pattern']} ({heuristic['error']})")
+    if len(rejected) > limit:
+        print(f"   ... {len(rejected) - limit} more")
+
 def main():
     parser = argparse.ArgumentParser(description="Dasa Indra QA Gate Scanner")
     parser.add_argument("target", help="Directory or file to scan")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for scanning (default: CPU count, 1 = serial)")
+    parser.add_argument("--changed", action="store_true",
+                        help="Only scan files git reports as staged, unstaged or untracked")
+    parser.add_argument("--since", metavar="REF",
+                        help="Only scan files that differ from the given git ref (implies --changed)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Ignore and do not update the findings cache in {CACHE_PATH.parent}/")
+    parser.add_argument("--route", action="append", default=[], metavar="EXT=DOMAINS",
+                        help="Override the domains for an extension, e.g. --route .vue=nodejs or --route .php=php,nodejs")
+    parser.add_argument("--all-domains", action="store_true",
+                        help="Disable language routing and check every file against every domain")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Record per-pattern cost and write a ranked report to {PROFILE_REPORT_PATH} (implies --no-cache)")
+    parser.add_argument("--max-size", type=float, default=DEFAULT_MAX_FILE_MB, metavar="MB",
+                        help=f"Skip files larger than this (default: {DEFAULT_MAX_FILE_MB} MB, 0 = no limit)")
+    parser.add_argument("--max-cost", type=float, default=GUARD_MS_PER_KB, metavar="MS_PER_KB",
+                        help=f"Cut off a pattern that spends more than this per KB of a file (default: {GUARD_MS_PER_KB}, 0 = no guard)")
     args = parser.parse_args()
+    if args.profile:
+        args.no_cache = True
+
+    routes = None
+    if not args.all_domains:
+        routes = dict(DOMAIN_ROUTES)
+        for override in args.route:
+            ext, _, domains = override.partition("=")
+            ext = ext if ext.startswith(".") else "." + ext
+            routes[ext] = tuple(d.strip() for d in domains.split(",") if d.strip())
 
     target_path = Path(args.target)
     skills_dir = Path(".agent/skills")
@@ -75,26 +939,77 @@ def main():
 
     print(f"🕵️‍♂️ Dasa Indra: Initiating Dynamic Engineering Failure Scan on {target_path}...")
     
-    # Load dynamic failures
-    dynamic_failures = load_dynamic_failures(skills_dir)
-    total_patterns = sum(len(p) for p in dynamic_failures.values())
-    print(f"📚 Loaded {total_patterns} failure heuristics from .agent/skills/")
+    # Load the heuristic catalog (rebuilt only when knowledge files change) and compile it once
+    catalog = load_catalog(skills_dir)
+    literals = {h["pattern"]: h["literals"] for h in catalog["heuristics"]}
+    bank = PatternBank(failures_from_catalog(catalog), literals)
+    bank.guard_ms_per_kb = args.max_cost if args.max_cost > 0 else None
+    print(f"📚 Loaded {len(bank)} failure heuristics from .agent/skills/")
+    report_rejected(catalog["rejected"])
 
-    if total_patterns == 0:
+    if len(bank) == 0:
         print("⚠️ Warning: No heuristics found. Did you copy engineering-failures-bible into .agent/skills/?")
     
+    targets = None
+    if args.changed or args.since:
+        targets = git_changed_files(target_path, args.since, routes)
+        if targets is None:
+            print("🟡 git file set unavailable (not a repository or bad ref). Falling back to a full scan.")
+        else:
+            print(f"🔁 Incremental mode: {len(targets)} changed file(s) to check")
+    if targets is None:
+        targets = collect_targets(target_path, routes)
+
+    if args.max_size > 0:
+        max_bytes = int(args.max_size * 1024 * 1024)
+        kept, oversized = [], []
+        for filepath in targets:
+            try:
+                (oversized if filepath.stat().st_size > max_bytes else kept).append(filepath)
+            except OSError:
+                kept.append(filepath)  # reported as unreadable by the scan itself
+        if oversized:
+            print(f"📦 Skipping {len(oversized)} file(s) larger than {args.max_size:g} MB (see --max-size):")
+            for filepath in oversized[:10]:
+                print(f"   - {filepath}")
+        targets = kept
+
+    known = {} if args.no_cache else load_cache(bank)
+    updated = dict(known)
+    reused = skipped = 0
     total_issues = []
-    if target_path.is_file():
-        total_issues.extend(scan_file(target_path, dynamic_failures))
-    else:
-        for root, _, files in os.walk(target_path):
-            if ".git" in root or "node_modules" in root or "target" in root:
-                continue
-            for file in files:
-                ext = Path(file).suffix
-                if ext in [".js", ".ts", ".go", ".rs", ".java", ".php", ".py", ".cpp"]:
-                    full_path = Path(root) / file
-                    total_issues.extend(scan_file(full_path, dynamic_failures))
+    profile = {}
+    guard_hits = {}  # pattern -> files where the guard cut it short
+    results = scan_files(targets, bank, args.jobs, known, routes, args.profile)
+    for filepath, (digest, hits, guarded, stats) in zip(targets, results):
+        if digest is None:
+            skipped += 1
+            continue
+        if digest in known:
+            reused += 1
+        for regex_str in guarded:
+            guard_hits[regex_str] = guard_hits.get(regex_str, 0) + 1
+        for regex_str, values in (stats or {}).items():
+            merged = profile.setdefault(regex_str, [0.0, 0, 0, 0])
+            for i, value in enumerate(values):
+                merged[i] += value
+        updated.pop(digest, None)
+        if not guarded:
+            updated[digest] = hits  # re-insert so recently seen content survives trimming
+        total_issues.extend(format_issues(filepath, bank, hits))
+    if not args.no_cache:
+        save_cache(bank, updated)
+        print(f"🗃️ Reused cached findings for {reused}/{len(targets)} file(s)")
+    if guard_hits:
+        print(f"⏱️ Cost guard cut short {len(guard_hits)} slow pattern(s); their results are partial and not cached:")
+        for regex_str, count in sorted(guard_hits.items(), key=lambda item: -item[1])[:10]:
+            print(f"   - {regex_str} ({count} file(s))")
+    if args.profile:
+        write_profile_report(profile, bank, guard_hits, len(targets) - skipped)
+        print(f"📈 Pattern profile written to {PROFILE_REPORT_PATH}")
+    if skipped:
+        print(f"ℹ️ Skipped {skipped} file(s) that are binary, unreadable or match no engineering-failures domain "
+              "(see --route / --all-domains)")
 
     if total_issues:
         print("\n❌ ENGINEERING FAILURES DETECTED:")
@@ -2,12 +2,44 @@
 """
 Dasa Dharma: Secret Guardian (security_scan.py)
 Scans git diffs or specific files for leaked API keys, tokens, and secrets.
+
+All patterns are compiled into one alternation with a named group per pattern,
+so every added line is matched once, and only lines containing one of the
+patterns' required literals (case-insensitively) reach the regex at all. Diffs
+are streamed from `git diff` line by line (never loaded whole), tracking the file
+and hunk so each finding reports the file and line number it was added at.
+
+`--history` sweeps every blob reachable from HEAD instead. `git rev-list --objects`
+lists each object once, so every unique blob is read exactly once, through one
+long-lived `git cat-file --batch` per worker process (`--jobs`). The last swept
+commit and its findings are checkpointed to `.artifacts/cache/security_history.json`,
+so later sweeps only read blobs added since.
+
+`--staged` scans the whole content of every staged blob (not just `+` lines),
+read through a single `git cat-file --batch` process, and also flags
+high-entropy tokens (Shannon entropy from a byte histogram) so minified or
+generated files cannot hide a key the patterns do not know.
+
+Usage:
+  python .agent/scripts/security_scan.py
+  python .agent/scripts/security_scan.py --staged
+  python .agent/scripts/security_scan.py --history [--full] [--jobs N]
 """
 
 import os
 import sys
+import json
+import argparse
 import subprocess
 import re
+import math
+from collections import Counter
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fs_snapshot import workspace_root  # noqa: E402
+from qa_gate import required_literals  # noqa: E402
 
 SECRET_PATTERNS = {
     "AWS Access Key": r"AKIA[0-9A-Z]{16}",
@@ -17,61 +49,473 @@ SECRET_PATTERNS = {
     "Private Key": r"-----BEGIN (RSA|OPENSSH|DSA|EC|PGP) PRIVATE KEY-----"
 }
 
-def get_git_diff():
-    """Get the current staged and unstaged git changes."""
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+# Added lines are prefiltered in batches of this many before per-line matching
+BATCH_LINES = 1024
+HISTORY_VERSION = "1"
+HISTORY_PATH = Path(".artifacts") / "cache" / "security_history.json"
+# Larger blobs are generated or vendored data, not hand-written config
+MAX_BLOB_BYTES = 2 * 1024 * 1024
+# Like git, a NUL byte in the first 8000 bytes marks a blob as binary
+BINARY_SNIFF_BYTES = 8000
+# Blobs handed to a worker per task, and the fewest worth a process pool
+BLOB_BATCH = 256
+PARALLEL_MIN_BLOBS = 512
+# Base64/URL-safe runs of this many bytes are token candidates; longer runs are embedded data, not keys
+ENTROPY_MIN_TOKEN = 32
+ENTROPY_MAX_TOKEN = 128
+TOKEN_CHARS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/_-"
+# Maps token bytes to "a" and everything else to " ", so runs are found with bytes.find
+TOKEN_MASK = bytes(ord("a") if byte in TOKEN_CHARS else ord(" ") for byte in range(256))
+# Random base64 of this length sits around 5 bits/char; identifiers and prose stay well under
+ENTROPY_BITS = 4.5
+# Lockfiles are full of integrity hashes
+ENTROPY_SKIP_FILES = {
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "Cargo.lock", "poetry.lock", "go.sum", "composer.lock",
+}
+
+def compile_patterns(patterns: dict):
+    """
+    Joins the patterns into one regex with a named group `p<i>` each. A leading
+    `(?i)` becomes a scoped `(?i:...)` group since global flags must start the regex.
+    Returns (regex, group name -> pattern name).
+    """
+    branches = []
+    names = {}
+    for i, (name, pattern) in enumerate(patterns.items()):
+        if pattern.startswith("(?i)"):
+            pattern = f"(?i:{pattern[4:]})"
+        branches.append(f"(?P<p{i}>{pattern})")
+        names[f"p{i}"] = name
+    return re.compile("|".join(branches)), names
+
+def trigger_literals(patterns: dict):
+    """
+    Lowercase literals one of which occurs in any match of any pattern, or None
+    when some pattern has no usable literal (then every line goes to the regex).
+    """
+    triggers = set()
+    for pattern in patterns.values():
+        literals = required_literals(pattern[4:] if pattern.startswith("(?i)") else pattern)
+        if not literals:
+            return None
+        triggers.update(literal.lower() for literal in literals)
+    return tuple(sorted(triggers))
+
+SECRET_REGEX, SECRET_NAMES = compile_patterns(SECRET_PATTERNS)
+SECRET_TRIGGERS = trigger_literals(SECRET_PATTERNS)
+
+def scan_lines(batch: list, leaks: list, triggers=SECRET_TRIGGERS):
+    """Matches (path, lineno, text) lines, skipping the whole batch when no trigger literal occurs in it."""
+    if triggers is not None:
+        lowered = "\n".join(text for _path, _lineno, text in batch).lower()
+        if not any(literal in lowered for literal in triggers):
+            return
+    for path, lineno, text in batch:
+        if triggers is not None:
+            low = text.lower()
+            if not any(literal in low for literal in triggers):
+                continue
+        for match in SECRET_REGEX.finditer(text):
+            leaks.append((SECRET_NAMES[match.lastgroup], path, lineno, text.strip()))
+
+def scan_text(path: str, text: str, leaks: list):
+    """
+    Matches a whole file's text. Trigger literals are located with str.find over
+    the lowered text, so only the lines holding one are handed to the regex.
+    """
+    lines = text.split("\n")
+    if SECRET_TRIGGERS is None:
+        candidates = range(len(lines))
+    else:
+        lowered = text.lower()
+        starts = set()
+        for literal in SECRET_TRIGGERS:
+            pos = lowered.find(literal)
+            while pos >= 0:
+                start = lowered.rfind("\n", 0, pos) + 1
+                starts.add(start)
+                end = lowered.find("\n", pos)
+                if end < 0:
+                    break
+                pos = lowered.find(literal, end)
+        # Lowering never adds or drops newlines, so line indexes match the original text
+        candidates = []
+        index = 0
+        previous = 0
+        for start in sorted(starts):
+            index += lowered.count("\n", previous, start)
+            previous = start
+            candidates.append(index)
+    for index in candidates:
+        for match in SECRET_REGEX.finditer(lines[index]):
+            leaks.append((SECRET_NAMES[match.lastgroup], path, index + 1, lines[index].strip()))
+
+class CatFile:
+    """One long-lived `git cat-file --batch` process answering object reads by name."""
+
+    def __init__(self, cwd=None):
+        self.proc = subprocess.Popen(["git", "cat-file", "--batch"], cwd=cwd, stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def read(self, name: str):
+        """Returns (object type, content) or None when the object does not exist."""
+        self.proc.stdin.write(name.encode("utf-8") + b"\n")
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().rstrip(b"\n")
+        if not header or header.endswith((b" missing", b" ambiguous")):
+            return None
+        _oid, kind, size = header.rsplit(b" ", 2)
+        data = self.proc.stdout.read(int(size))
+        self.proc.stdout.read(1)  # trailing newline
+        return kind.decode("ascii"), data
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+def scan_blobs(blobs: list, cat: CatFile) -> list:
+    """Scans (blob id, path) pairs read through `cat`. Returns (pattern name, path, line number, line, blob id)."""
+    leaks = []
+    for oid, path in blobs:
+        obj = cat.read(oid)
+        if obj is None or b"\0" in obj[1][:BINARY_SNIFF_BYTES]:
+            continue
+        found = []
+        scan_text(path, obj[1].decode("utf-8", "replace"), found)
+        leaks.extend((name, path, lineno, line, oid) for name, path, lineno, line in found)
+    return leaks
+
+_worker_cat = None
+
+def _init_worker():
+    """Starts the worker's own cat-file process, reused for every batch it is given."""
+    global _worker_cat
+    _worker_cat = CatFile()
+
+def _scan_in_worker(blobs: list) -> list:
+    return scan_blobs(blobs, _worker_cat)
+
+def shannon_entropy(token: bytes) -> float:
+    """Bits per byte of a token, from its byte histogram."""
+    n = len(token)
+    return math.log2(n) - sum(count * math.log2(count) for count in Counter(token).values()) / n
+
+def entropy_tokens(path: str, data: bytes, skip_lines=()) -> list:
+    """
+    Flags base64-like tokens mixing upper case, lower case and digits whose entropy
+    reaches ENTROPY_BITS. Candidate runs are located on a translated mask of the
+    data, so the only per-byte work is done by bytes.translate/find.
+    Returns (pattern name, path, line number, line) like scan_lines.
+    """
+    if path.rsplit("/", 1)[-1] in ENTROPY_SKIP_FILES:
+        return []
+    leaks = []
+    mask = data.translate(TOKEN_MASK)
+    run = b"a" * ENTROPY_MIN_TOKEN
+    lineno = 1
+    counted = 0
+    pos = mask.find(run)
+    while pos >= 0:
+        # Searching resumes after each run, so every hit is the start of one
+        end = mask.find(b" ", pos)
+        end = len(mask) if end < 0 else end
+        token = data[pos:end]
+        if (end - pos <= ENTROPY_MAX_TOKEN and not (token.isalpha() or token.isdigit())
+                and token.lower() != token and token.upper() != token
+                # Paths and slugs split words with separators far more often than random base64 does
+                and sum(token.count(sep) for sep in (b"/", b"-", b"_")) * 10 <= len(token)
+                and shannon_entropy(token) >= ENTROPY_BITS):
+            lineno += data.count(b"\n", counted, pos)
+            counted = pos
+            if lineno not in skip_lines:
+                start = data.rfind(b"\n", 0, pos) + 1
+                line_end = data.find(b"\n", pos)
+                line = data[start:line_end if line_end >= 0 else len(data)].decode("utf-8", "replace")
+                leaks.append(("High-Entropy Token", path, lineno, line.strip()))
+        pos = mask.find(run, end)
+    return leaks
+
+def staged_blobs() -> list:
+    """
+    Lists (blob id, path) for every file added or modified in the index, from one
+    `git diff --cached --raw`. Raises CalledProcessError outside a repository.
+    """
+    out = subprocess.check_output(["git", "diff", "--cached", "--raw", "-z", "--no-renames", "--diff-filter=AM"],
+                                  stderr=subprocess.DEVNULL)
+    fields = out.decode("utf-8", "replace").split("\0")
+    blobs = []
+    for meta, path in zip(fields[0::2], fields[1::2]):
+        # :<old mode> <new mode> <old id> <new id> <status>
+        _old_mode, new_mode, _old_oid, new_oid, _status = meta.lstrip(":").split(" ")
+        if new_mode != "160000":  # submodule commits are not blobs
+            blobs.append((new_oid, path))
+    return blobs
+
+def status_paths() -> list:
+    """
+    Paths `git status` reports (staged, unstaged and untracked, each file inside
+    untracked directories too). Raises CalledProcessError outside a repository.
+    """
+    out = subprocess.check_output(["git", "status", "--porcelain", "-z", "--untracked-files=all"], stderr=subprocess.DEVNULL)
+    fields = out.decode("utf-8", "replace").split("\0")
+    paths = []
+    index = 0
+    while index < len(fields):
+        entry = fields[index]
+        index += 1
+        if len(entry) < 4:
+            continue
+        paths.append(entry[3:])
+        if "R" in entry[:2] or "C" in entry[:2]:
+            index += 1  # the rename/copy source follows as its own field
+    return paths
+
+def is_env_file(path: str) -> bool:
+    name = path.rsplit("/", 1)[-1]
+    return (name == ".env" or name.startswith(".env.")) and ".example" not in name
+
+def blob_chunks(data: bytes, size: int = MAX_BLOB_BYTES):
+    """
+    Splits a blob into pieces of at most `size` bytes, cut after a newline or else
+    between tokens so none is broken in two. Yields (lines before the piece, piece).
+    """
+    offset = 0
+    lines = 0
+    while offset < len(data):
+        end = offset + size
+        if end < len(data):
+            cut = data.rfind(b"\n", offset, end) + 1
+            if cut <= offset:
+                # One huge (minified) line: cut at the last byte that cannot be part of a token
+                cut = offset + data[offset:end].translate(TOKEN_MASK).rfind(b" ") + 1
+            end = cut if cut > offset else end
+        piece = data[offset:end]
+        yield lines, piece
+        lines += piece.count(b"\n")
+        offset = end
+
+def scan_staged(blobs: list) -> list:
+    """
+    Scans whole staged blobs for patterns and high-entropy tokens through one
+    cat-file process. Blobs over MAX_BLOB_BYTES are scanned piece by piece.
+    """
+    leaks = []
+    cat = CatFile()
+    try:
+        for oid, path in blobs:
+            obj = cat.read(oid)
+            if obj is None:
+                continue
+            for lines, piece in blob_chunks(obj[1]):
+                found = []
+                scan_text(path, piece.decode("utf-8", "replace"), found)
+                found.extend(entropy_tokens(path, piece, {lineno for _name, _path, lineno, _line in found}))
+                leaks.extend(sorted(((name, path, lines + lineno, line) for name, path, lineno, line in found),
+                                    key=lambda leak: leak[2]))
+    finally:
+        cat.close()
+    return leaks
+
+def git_line(*args):
+    """First line of a git command's output, or None when it fails."""
+    try:
+        out = subprocess.check_output(["git", *args], stderr=subprocess.DEVNULL).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.splitlines()[0] if out else None
+
+def history_blobs(head: str, since: str = None) -> list:
+    """
+    Lists (blob id, path) for every blob reachable from `head` but not from `since`,
+    skipping oversized ones. rev-list reports each object once, under the first
+    path it was seen at, so the result is already deduplicated by object id.
+    """
+    revs = [head] + ([f"^{since}"] if since else [])
+    rev_list = subprocess.Popen(["git", "rev-list", "--objects", *revs],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    check = subprocess.Popen(["git", "cat-file", "--batch-check=%(objecttype) %(objectname) %(objectsize) %(rest)"],
+                             stdin=rev_list.stdout, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    rev_list.stdout.close()
+    blobs = []
+    for raw in check.stdout:
+        parts = raw.decode("utf-8", "replace").rstrip("\n").split(" ", 3)
+        if parts[0] == "blob" and len(parts) == 4 and int(parts[2]) <= MAX_BLOB_BYTES:
+            blobs.append((parts[1], parts[3]))
+    check.stdout.close()
+    if check.wait() or rev_list.wait():
+        raise subprocess.CalledProcessError(rev_list.returncode or check.returncode, "git rev-list --objects")
+    return blobs
+
+def load_checkpoint(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") == HISTORY_VERSION:
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": HISTORY_VERSION, "head": None, "findings": []}
+
+def save_checkpoint(path: Path, checkpoint: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(checkpoint, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+def sweep_history(jobs: int, full: bool = False) -> tuple:
+    """
+    Scans blobs added to HEAD's history since the checkpointed commit (all of them
+    with `full` or when that commit no longer exists), then moves the checkpoint to
+    HEAD. Returns (findings including earlier sweeps', blobs scanned now).
+    """
+    head = git_line("rev-parse", "--verify", "--quiet", "HEAD")
+    if head is None:
+        raise subprocess.CalledProcessError(1, "git rev-parse HEAD")
+    root, _in_git = workspace_root(Path.cwd())
+    checkpoint_path = root / HISTORY_PATH
+    checkpoint = {"version": HISTORY_VERSION, "head": None, "findings": []} if full else load_checkpoint(checkpoint_path)
+    since = checkpoint["head"]
+    if since and git_line("rev-parse", "--verify", "--quiet", f"{since}^{{commit}}") is None:
+        # Rewritten history: the old tip is gone, so everything is swept again
+        since = None
+        checkpoint["findings"] = []
+    if since == head:
+        return checkpoint["findings"], 0
+
+    blobs = history_blobs(head, since)
+    batches = [blobs[i:i + BLOB_BATCH] for i in range(0, len(blobs), BLOB_BATCH)]
+    if jobs > 1 and len(blobs) >= PARALLEL_MIN_BLOBS:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+            results = list(pool.map(_scan_in_worker, batches))
+    else:
+        cat = CatFile()
+        try:
+            results = [scan_blobs(batch, cat) for batch in batches]
+        finally:
+            cat.close()
+    findings = checkpoint["findings"] + [list(leak) for result in results for leak in result]
+    save_checkpoint(checkpoint_path, {"version": HISTORY_VERSION, "head": head, "findings": findings})
+    return findings, len(blobs)
+
+def run_history(jobs: int, full: bool):
+    print("🛡️  [Dasa Dharma] Sweeping git history for committed secrets...")
     try:
-        # Get staged changes
-        staged = subprocess.check_output(["git", "diff", "--cached"]).decode('utf-8')
-        # Get unstaged changes
-        unstaged = subprocess.check_output(["git", "diff"]).decode('utf-8')
-        return staged + "\n" + unstaged
+        findings, scanned = sweep_history(jobs, full)
     except subprocess.CalledProcessError:
-        print("🟡 [Dharma Guardian] Not a git repository or no commits yet. Skipping diff scan.")
-        return ""
-    except Exception as e:
-        print(f"🔴 [Dharma Guardian] Error executing git diff: {e}")
-        return ""
+        print("🟡 [Dharma Guardian] Not a git repository or no commits yet. Skipping history sweep.")
+        sys.exit(0)
+    except OSError as e:
+        print(f"🔴 [Dharma Guardian] Error executing git: {e}")
+        sys.exit(0)
+
+    print(f"[+] Scanned {scanned} new blob(s) since the last checkpoint.")
+    if findings:
+        print("\n🔴 [Dharma Guardian] FATAL: Potential Secrets Found in git history:")
+        for name, path, lineno, line, oid in findings:
+            print(f"  - [{name}] {path}:{lineno} (blob {oid[:12]}): {line[:80]}...")
+        print("\nFind the commits with `git log --all --find-object=<blob>`, then rotate the exposed credentials.")
+        sys.exit(1)
 
-def scan_diff(diff_text):
-    """Scan the diff text for secret patterns."""
+    print("🟢 [Dharma Guardian] History Sweep Passed. No obvious secrets committed.")
+    sys.exit(0)
+
+def stream_git_diff(*args):
+    """
+    Yields the lines of `git diff <args>` as they are produced. Raises
+    CalledProcessError when git fails (e.g. outside a repository).
+    """
+    cmd = ["git", "diff", "--no-color", "--no-ext-diff", "--unified=0", *args]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        for raw in proc.stdout:
+            yield raw.decode("utf-8", "replace").rstrip("\r\n")
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+def scan_diff(diff_lines):
+    """
+    Scans unified diff lines for secret patterns on added lines (+ but not +++).
+    Returns (pattern name, file, line number, line) per finding.
+    """
     leaks = []
-    
-    # Only scan added/modified lines in diff (+ but not +++)
-    diff_lines = [line for line in diff_text.split('\n') if line.startswith('+') and not line.startswith('+++')]
-    
+    batch = []
+    path = None
+    lineno = 0
     for line in diff_lines:
-        for name, pattern in SECRET_PATTERNS.items():
-            if re.search(pattern, line):
-                leaks.append((name, line.strip()))
-                
+        if line.startswith("+++ "):
+            target = line[4:]
+            path = target[2:] if target.startswith("b/") else target
+            continue
+        if line.startswith("@@"):
+            match = HUNK_HEADER.match(line)
+            lineno = int(match.group(1)) if match else 0
+            continue
+        if line.startswith("+"):
+            batch.append((path, lineno, line[1:]))
+            if len(batch) >= BATCH_LINES:
+                scan_lines(batch, leaks)
+                batch = []
+            lineno += 1
+        elif line.startswith(" "):
+            lineno += 1
+    scan_lines(batch, leaks)
     return leaks
 
 def main():
+    parser = argparse.ArgumentParser(description="Dasa Dharma: secret leak detection for git changes")
+    parser.add_argument("--staged", action="store_true",
+                        help="Scan the full content of staged files, including high-entropy tokens")
+    parser.add_argument("--history", action="store_true",
+                        help="Sweep every blob in HEAD's history instead of the current diff")
+    parser.add_argument("--full", action="store_true", help="With --history, ignore the checkpoint and sweep everything")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for --history (default: CPU count, 1 = serial)")
+    args = parser.parse_args()
+
+    if args.history:
+        run_history(args.jobs, args.full)
+
     print("🛡️  [Dasa Dharma] Initializing Secret Guardian Scan...")
     
-    # 1. Scan .env files (preventing accidental .env commits)
+    # 1. Scan .env files (preventing accidental .env commits): what is staged under
+    # --staged, otherwise anything in the working tree, untracked files included
+    staged = []
     try:
-        git_status = subprocess.check_output(["git", "status", "-s"]).decode('utf-8')
-        status_lines = git_status.split('\n')
-        for line in status_lines:
-            if '.env' in line and not '.example' in line:
-                 print(f"🔴 [Dharma Guardian] FATAL: You are attempting to commit a raw .env file!\nLine: {line.strip()}")
-                 sys.exit(1)
-    except subprocess.CalledProcessError:
-        pass # Not a git repo
+        if args.staged:
+            staged = staged_blobs()
+            env_paths = [path for _oid, path in staged]
+        else:
+            env_paths = status_paths()
+    except (OSError, subprocess.CalledProcessError):
+        env_paths = []  # Not a git repo
+    for path in env_paths:
+        if is_env_file(path):
+            print(f"🔴 [Dharma Guardian] FATAL: You are attempting to commit a raw .env file!\nFile: {path}")
+            sys.exit(1)
 
-    # 2. Scan Git Diff for hardcoded secrets
-    diff_text = get_git_diff()
-    if not diff_text:
-        print("🟢 [Dharma Guardian] No changes to scan. Pass.")
+    # 2. Scan staged blobs, or the Git Diff (staged, then unstaged), for hardcoded secrets
+    leaks = []
+    try:
+        if args.staged:
+            leaks = scan_staged(staged)
+        else:
+            for diff_args in (("--cached",), ()):
+                leaks.extend(scan_diff(stream_git_diff(*diff_args)))
+    except subprocess.CalledProcessError:
+        print("🟡 [Dharma Guardian] Not a git repository or no commits yet. Skipping diff scan.")
+        sys.exit(0)
+    except OSError as e:
+        print(f"🔴 [Dharma Guardian] Error executing git diff: {e}")
         sys.exit(0)
-        
-    leaks = scan_diff(diff_text)
     
     if leaks:
-        print("\n🔴 [Dharma Guardian] FATAL: Potential Secret Leaks Detected in `git diff`:")
-        for name, line in leaks:
-            print(f"  - [{name}] Found in line: {line[:80]}...")
+        source = "staged files" if args.staged else "`git diff`"
+        print(f"\n🔴 [Dharma Guardian] FATAL: Potential Secret Leaks Detected in {source}:")
+        for name, path, lineno, line in leaks:
+            print(f"  - [{name}] {path}:{lineno}: {line[:80]}...")
         print("\nHALTING COMMIT. Remove hardcoded secrets and use environment variables.")
         sys.exit(1)
         
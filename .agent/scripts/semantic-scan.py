@@ -6,51 +6,574 @@ Persona: Dasa Dwipa (The Scout)
 Usage:
   python .agent/scripts/semantic-scan.py "JWT authentication middleware"
   python .agent/scripts/semantic-scan.py "where is the login form handled"
+  python .agent/scripts/semantic-scan.py --literal "verifyToken("
+  python .agent/scripts/semantic-scan.py --regex "def \\w+_token\\("
+
+Without osgrep (or with --native) natural-language queries are ranked offline:
+source files are split into function/class chunks at the symbols context_mapper.py
+extracts, and chunks are scored by TF-IDF over identifier-split terms from a
+persisted index at `.artifacts/cache/semantic/`.
+
+--literal/--regex queries are answered from a built-in trigram index at
+`.artifacts/cache/trigram/`: posting lists of file ids per lowercase trigram,
+stored as delta-encoded arrays in append-only segments. Each run only re-reads
+files whose size/mtime changed, writing them to a new segment; segments are
+compacted once there are too many or most entries are stale.
+
+Matches are streamed: files are read line by line, hits are printed grouped per
+file with `--context` lines around them, and the search stops as soon as
+`--max-results` is reached. osgrep output is streamed the same way, with a
+`--timeout` after which the native ranked search answers instead.
 """
 
 import sys
 import subprocess
 import shutil
 import os
+import re
+import ast
+import json
+import bisect
+import signal
+import argparse
+import threading
+from array import array
+from collections import deque
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fs_snapshot import snapshot  # noqa: E402
+import tfidf_vectors  # noqa: E402
+
+INDEX_VERSION = "1"
+INDEX_DIR = Path(".artifacts") / "cache" / "trigram"
+SOURCE_EXTENSIONS = {
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".vue", ".svelte", ".php",
+    ".go", ".rs", ".java", ".kt", ".cs", ".rb", ".c", ".h", ".cpp", ".hpp", ".swift",
+    ".sh", ".sql", ".html", ".css", ".scss", ".md", ".json", ".yml", ".yaml", ".toml",
+}
+IGNORE_DIRS = {".git", "node_modules", "target", "dist", "build", "vendor", "__pycache__", ".gemini", ".artifacts"}
+# Larger files are almost always generated or data; they are left out of the index
+MAX_INDEX_BYTES = 1024 * 1024
+SNIFF_BYTES = 8192
+# A new segment is written per incremental update; past this many they are compacted
+MAX_SEGMENTS = 8
+DEFAULT_MAX_RESULTS = 200
+DEFAULT_TIMEOUT = 30
+# Matched lines are cut to this many characters so minified files stay readable
+MAX_LINE_CHARS = 200
+# Posting deltas are stored in the narrowest array type that fits
+POSTING_TYPES = "BHI"
+TRIGRAM = re.compile(rb"...", re.DOTALL)
+
+SEMANTIC_DIR = Path(".artifacts") / "cache" / "semantic"
+# Code (not docs/config) is chunked for ranked search
+CHUNK_EXTENSIONS = {
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".vue", ".svelte", ".php",
+    ".go", ".rs", ".java", ".kt", ".cs", ".rb", ".c", ".h", ".cpp", ".hpp", ".swift", ".sh",
+}
+# Files without recognizable symbols are cut into windows of this many lines
+MAX_CHUNK_LINES = 120
+# Symbol names say more about a chunk than its body, so their terms are repeated
+NAME_WEIGHT = 3
+TOP_CHUNKS = 10
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+IDENTIFIER_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from", "how", "in",
+    "is", "it", "of", "on", "or", "the", "this", "to", "what", "when", "where", "which", "who",
+    "with", "self", "def", "function", "func", "fn", "return", "const", "let", "var", "import",
+    "new", "if", "else", "true", "false", "none", "null", "undefined", "pub", "mut",
+}
 
 def check_osgrep():
     return shutil.which("osgrep") is not None
 
-def run_semantic_search(query: str) -> int:
-    if not check_osgrep():
-        print("[!] osgrep is not installed. Install it with: npm install -g osgrep")
-        print(f"[!] Falling back to grep for: {query}")
-        result = subprocess.run(
-            ["grep", "-r", "--include=*.ts", "--include=*.py", "--include=*.js",
-             "--include=*.php", "-n", query, "."],
-            capture_output=True, text=True
-        )
-        if result.stdout:
-            print(result.stdout[:3000])
-        return result.returncode
+def walk_sources(root: Path):
+    """Yields (rel_path, size, mtime_ns) for indexable files under root in walk order, from the shared filesystem snapshot."""
+    snap, under = snapshot(root)
+    yield from snap.iter_files(under, SOURCE_EXTENSIONS, IGNORE_DIRS)
+
+def file_trigrams(filepath: Path):
+    """Returns the set of lowercase byte trigrams in a file, or None for binary/oversized files."""
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read(MAX_INDEX_BYTES + 1)
+    except OSError:
+        return None
+    if len(data) > MAX_INDEX_BYTES or b"\0" in data[:SNIFF_BYTES]:
+        return None
+    data = data.lower()
+    grams = set(TRIGRAM.findall(data))
+    grams.update(TRIGRAM.findall(data, 1))
+    grams.update(TRIGRAM.findall(data, 2))
+    return grams
+
+def write_segment(path: Path, postings: dict):
+    """
+    Writes gram -> sorted file ids as one segment: a JSON header line, then the
+    sorted gram keys (uint32), per-gram delta width codes, byte offsets into the
+    blob, and the blob of delta-encoded id arrays.
+    """
+    grams = sorted(postings)
+    keys = array("I", (int.from_bytes(gram, "big") for gram in grams))
+    widths = array("B")
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for gram in grams:
+        ids = postings[gram]
+        deltas = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+        top = max(deltas)
+        code = 0 if top < 1 << 8 else 1 if top < 1 << 16 else 2
+        blob += array(POSTING_TYPES[code], deltas).tobytes()
+        widths.append(code)
+        offsets.append(len(blob))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(json.dumps({"grams": len(grams)}).encode("utf-8") + b"\n")
+        keys.tofile(f)
+        widths.tofile(f)
+        offsets.tofile(f)
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+class Segment:
+    """Read side of a segment; only the posting lists asked for are decoded."""
+
+    def __init__(self, path: Path):
+        self.file = open(path, "rb")
+        count = json.loads(self.file.readline())["grams"]
+        self.keys = array("I")
+        self.keys.fromfile(self.file, count)
+        self.widths = array("B")
+        self.widths.fromfile(self.file, count)
+        self.offsets = array("Q")
+        self.offsets.fromfile(self.file, count + 1)
+        self.base = self.file.tell()
+
+    def postings(self, gram: bytes) -> list:
+        key = int.from_bytes(gram, "big")
+        slot = bisect.bisect_left(self.keys, key)
+        if slot == len(self.keys) or self.keys[slot] != key:
+            return []
+        self.file.seek(self.base + self.offsets[slot])
+        deltas = array(POSTING_TYPES[self.widths[slot]])
+        deltas.frombytes(self.file.read(self.offsets[slot + 1] - self.offsets[slot]))
+        return list(accumulate(deltas))
+
+    def close(self):
+        self.file.close()
+
+def load_manifest(index_dir: Path) -> dict:
+    try:
+        manifest = json.loads((index_dir / "manifest.json").read_text(encoding="utf-8"))
+        if manifest.get("version") == INDEX_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": INDEX_VERSION, "files": [], "segments": [], "next_segment": 0}
+
+def save_manifest(index_dir: Path, manifest: dict):
+    index_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_dir / "manifest.tmp"
+    tmp_path.write_text(json.dumps(manifest, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, index_dir / "manifest.json")
+
+def refresh_index(root: Path, index_dir: Path, rebuild: bool = False) -> tuple:
+    """
+    Brings the trigram index up to date with the tree. Files are identified by id
+    (their position in manifest["files"]); a changed or deleted file's entry becomes
+    None and a changed file is re-added under a new id in a fresh segment.
+    Entries are [rel_path, size, mtime_ns, indexed]. Returns (manifest, files re-read).
+    """
+    manifest = load_manifest(index_dir)
+    if rebuild:
+        manifest["files"] = []
+    files = manifest["files"]
+    by_path = {entry[0]: file_id for file_id, entry in enumerate(files) if entry}
+    seen = set()
+    new_ids = []
+    for rel_path, size, mtime_ns in walk_sources(root):
+        seen.add(rel_path)
+        file_id = by_path.get(rel_path)
+        if file_id is not None:
+            if files[file_id][1] == size and files[file_id][2] == mtime_ns:
+                continue
+            files[file_id] = None
+        new_ids.append(len(files))
+        files.append([rel_path, size, mtime_ns, False])
+    removed = [file_id for rel_path, file_id in by_path.items() if rel_path not in seen]
+    for file_id in removed:
+        files[file_id] = None
+    if not new_ids and not removed and (index_dir / "manifest.json").exists():
+        return manifest, 0
+
+    live = [entry for entry in files if entry]
+    stale_segments = []
+    if rebuild or len(manifest["segments"]) >= MAX_SEGMENTS or len(files) > 2 * len(live):
+        stale_segments = manifest["segments"]
+        files[:] = live
+        manifest["segments"] = []
+        new_ids = list(range(len(files)))
+
+    postings = {}
+    for file_id in new_ids:
+        grams = file_trigrams(root / files[file_id][0])
+        if grams is None:
+            continue
+        files[file_id][3] = True
+        for gram in grams:
+            postings.setdefault(gram, []).append(file_id)
+    if postings:
+        name = f"seg-{manifest['next_segment']:05d}.bin"
+        manifest["next_segment"] += 1
+        write_segment(index_dir / name, postings)
+        manifest["segments"].append(name)
+    save_manifest(index_dir, manifest)
+    for name in stale_segments:
+        try:
+            os.remove(index_dir / name)
+        except OSError:
+            pass
+    return manifest, len(new_ids)
+
+def query_literals(query: str, is_regex: bool):
+    """Literal alternatives one of which every match must contain, or None when nothing narrows the search."""
+    if not is_regex:
+        return [query]
+    # qa_gate's literal extraction is the same one its prefilter uses; imported on demand
+    from qa_gate import required_literals
+    literals = required_literals(query)
+    return sorted(literals) if literals else None
+
+def literal_trigrams(literal: str, ignore_case: bool = False) -> set:
+    r"""
+    Trigrams a file containing `literal` must have in the index. Lowercased the way
+    file_trigrams() does it (bytes.lower(), ASCII only); with ignore_case, grams
+    holding non-ASCII bytes are dropped since the regex may fold them differently.
+
+    >>> sorted(literal_trigrams("\u00c9col"))
+    [b'col', b'\x89co', b'\xc3\x89c']
+    >>> sorted(literal_trigrams("\u00c9col", ignore_case=True))
+    [b'col']
+    """
+    data = literal.encode("utf-8").lower()
+    grams = {data[i:i + 3] for i in range(len(data) - 2)}
+    if ignore_case:
+        grams = {gram for gram in grams if gram.isascii()}
+    return grams
+
+def candidate_ids(segments: list, literals, ignore_case: bool = False) -> set:
+    """
+    Intersects trigram postings per literal (rarest first) and unions the
+    alternatives. Returns None when some literal is too short to narrow anything.
+    """
+    if literals is None:
+        return None
+    candidates = set()
+    for literal in literals:
+        grams = literal_trigrams(literal, ignore_case)
+        if not grams:
+            return None
+        postings = []
+        for gram in grams:
+            ids = set()
+            for segment in segments:
+                ids.update(segment.postings(gram))
+            postings.append(ids)
+        postings.sort(key=len)
+        found = postings[0]
+        for ids in postings[1:]:
+            if not found:
+                break
+            found = found & ids
+        candidates |= found
+    return candidates
+
+def grep_file(filepath: Path, matcher, context: int = 0):
+    """
+    Streams one file, yielding (lineno, line, is_match) for every match and up to
+    `context` lines before and after it. Closing the generator closes the file.
+    """
+    before = deque(maxlen=context)
+    after = 0
+    with open(filepath, encoding="utf-8", errors="replace") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if matcher.search(line):
+                yield from ((n, text, False) for n, text in before)
+                before.clear()
+                yield lineno, line, True
+                after = context
+            elif after:
+                yield lineno, line, False
+                after -= 1
+            elif context:
+                before.append((lineno, line))
+
+def native_search(root: Path, query: str, is_regex: bool = False, ignore_case: bool = False, rebuild: bool = False,
+                  max_results: int = DEFAULT_MAX_RESULTS, context: int = 0) -> int:
+    index_dir = root / INDEX_DIR
+    manifest, reread = refresh_index(root, index_dir, rebuild)
+    files = manifest["files"]
+    try:
+        matcher = re.compile(query if is_regex else re.escape(query), re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        print(f"[x] Invalid regex: {e}")
+        return 2
+
+    segments = [Segment(index_dir / name) for name in manifest["segments"]]
+    try:
+        candidates = candidate_ids(segments, query_literals(query, is_regex), ignore_case)
+    finally:
+        for segment in segments:
+            segment.close()
+    if candidates is None:
+        candidates = range(len(files))
+    candidates = [file_id for file_id in sorted(candidates) if files[file_id] and files[file_id][3]]
+    indexed = sum(1 for entry in files if entry and entry[3])
+
+    matches = 0
+    per_file = []
+    checked = 0
+    for file_id in candidates:
+        if matches >= max_results:
+            break
+        rel_path = files[file_id][0]
+        checked += 1
+        last = None
+        hits = 0
+        lines = grep_file(root / rel_path, matcher, context)
+        try:
+            for lineno, line, is_match in lines:
+                if last is None:
+                    print(rel_path)
+                elif lineno > last + 1:
+                    print("  --")
+                print(f"  {lineno}{':' if is_match else '-'} {line[:MAX_LINE_CHARS]}")
+                last = lineno
+                if is_match:
+                    hits += 1
+                    matches += 1
+                    if matches >= max_results:
+                        break
+        except OSError:
+            continue
+        finally:
+            lines.close()
+        if hits:
+            per_file.append((rel_path, hits))
+
+    stopped = matches >= max_results
+    busiest = ", ".join(f"{rel_path} ({hits})" for rel_path, hits in sorted(per_file, key=lambda item: -item[1])[:5])
+    print(f"[+] {matches} match(es) in {len(per_file)} file(s)"
+          + (f", stopped at --max-results {max_results}" if stopped else "")
+          + f"; read {checked} of {len(candidates)} candidate(s), {indexed} indexed, {reread} re-indexed")
+    if busiest:
+        print(f"[+] Most matches: {busiest}")
+    return 0 if matches else 1
+
+def stem(word: str) -> str:
+    for suffix in ("ations", "ation", "ings", "ing", "ers", "er", "ed", "es", "e", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: len(word) - len(suffix)]
+    return word
+
+def code_terms(text: str) -> list:
+    """
+    Splits identifiers on snake_case/camelCase boundaries into stemmed lowercase
+    terms; a compound identifier also keeps its whole lowercase form as a term.
+    """
+    terms = []
+    for identifier in IDENTIFIER.findall(text):
+        parts = [part.lower() for part in IDENTIFIER_PART.findall(identifier)]
+        if len(parts) > 1:
+            terms.append(identifier.lower().replace("_", ""))
+        terms.extend(stem(part) for part in parts if len(part) > 1 and part not in STOPWORDS)
+    return terms
+
+def code_chunks(rel_path: str, content: str) -> list:
+    """
+    Splits a source file into [start, end, kind, name] chunks, one per symbol that
+    context_mapper.py recognizes, each running until the next symbol starts. Lines
+    before the first symbol (or a file without symbols) become "module" chunks.
+    """
+    import context_mapper
+
+    suffix = os.path.splitext(rel_path)[1]
+    symbols = []
+    if suffix == ".py":
+        try:
+            symbols = context_mapper.python_symbols(ast.parse(content))
+        except (SyntaxError, ValueError):
+            pass
+    elif suffix in context_mapper.SYMBOL_LANGUAGES:
+        symbols = context_mapper.regex_symbols(content, context_mapper.SYMBOL_LANGUAGES[suffix])
+
+    total = content.count("\n") + 1
+    starts = {}
+    for name, kind, line, parent in symbols:
+        starts.setdefault(line, (kind, f"{parent}.{name}" if parent else name))
+    lines = sorted(starts)
+    chunks = []
+    first = lines[0] if lines else total + 1
+    module = os.path.splitext(os.path.basename(rel_path))[0]
+    for start in range(1, first, MAX_CHUNK_LINES):
+        chunks.append([start, min(first - 1, start + MAX_CHUNK_LINES - 1), "module", module])
+    for index, line in enumerate(lines):
+        end = lines[index + 1] - 1 if index + 1 < len(lines) else total
+        chunks.append([line, end, *starts[line]])
+    return chunks
+
+def chunk_file(root: Path, rel_path: str) -> list:
+    """Returns [start, end, kind, name, term counts] for each chunk of one file."""
+    try:
+        content = (root / rel_path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return []
+    lines = content.split("\n")
+    path_terms = code_terms(rel_path.replace("/", " "))
+    chunks = []
+    for start, end, kind, name in code_chunks(rel_path, content):
+        counts = {}
+        parent, _, leaf = name.rpartition(".")
+        terms = code_terms("\n".join(lines[start - 1:end])) + code_terms(leaf) * NAME_WEIGHT + code_terms(parent) + path_terms
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        if counts:
+            chunks.append([start, end, kind, name, counts])
+    return chunks
+
+def refresh_chunks(root: Path, index_dir: Path, rebuild: bool = False) -> int:
+    """
+    Re-chunks only files whose size/mtime changed (entries are [size, mtime_ns, chunks])
+    and repacks the vectors when anything moved. Returns the number of files re-read.
+    """
+    manifest = {}
+    if not rebuild:
+        try:
+            data = json.loads((index_dir / "chunks.json").read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                manifest = data["files"]
+        except (OSError, ValueError):
+            pass
+    files = {}
+    reread = 0
+    for rel_path, size, mtime_ns in walk_sources(root):
+        if os.path.splitext(rel_path)[1] not in CHUNK_EXTENSIONS:
+            continue
+        entry = manifest.get(rel_path)
+        if entry is None or entry[0] != size or entry[1] != mtime_ns:
+            entry = [size, mtime_ns, chunk_file(root, rel_path) if size <= MAX_INDEX_BYTES else []]
+            reread += 1
+        files[rel_path] = entry
+    vectors_path = index_dir / "vectors.bin"
+    if reread or files.keys() != manifest.keys() or not vectors_path.exists():
+        index_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_dir / "chunks.tmp"
+        tmp_path.write_text(json.dumps({"version": INDEX_VERSION, "files": files}, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, index_dir / "chunks.json")
+        docs = (([rel_path, start, end, kind, name], counts) for rel_path in sorted(files)
+                for start, end, kind, name, counts in files[rel_path][2])
+        tfidf_vectors.save_vectors(vectors_path, *tfidf_vectors.build_vectors(docs))
+    return reread
+
+def rank_chunks(vectors_path: Path, query: str) -> list:
+    """Scores chunks by cosine similarity, reading only the posting slices of the query terms."""
+    return tfidf_vectors.rank(vectors_path, code_terms(query))
+
+def stream_osgrep(query: str, max_results: int, timeout: int):
+    """
+    Streams `osgrep search` output as it arrives, stopping after max_results
+    non-empty lines. Returns the exit code, or None when the timeout expired.
+    """
+    # Own process group on POSIX so helpers osgrep spawns die with it and release the pipe
+    proc = subprocess.Popen(["osgrep", "search", query], stdout=subprocess.PIPE, text=True,
+                            encoding="utf-8", errors="replace", start_new_session=os.name == "posix")
+    timed_out = threading.Event()
+
+    def stop():
+        try:
+            if os.name == "posix":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except OSError:
+            pass
+
+    def expire():
+        timed_out.set()
+        stop()
+
+    timer = threading.Timer(timeout, expire)
+    timer.start()
+    shown = 0
+    try:
+        for line in proc.stdout:
+            print(line, end="")
+            shown += bool(line.strip())
+            if shown >= max_results:
+                print(f"[+] Stopped after --max-results {max_results} line(s)")
+                stop()
+                return 0
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        proc.wait()
+    return None if timed_out.is_set() else returncode
+
+def ranked_search(root: Path, query: str, top: int = TOP_CHUNKS, rebuild: bool = False) -> int:
+    index_dir = root / SEMANTIC_DIR
+    reread = refresh_chunks(root, index_dir, rebuild)
+    results = rank_chunks(index_dir / "vectors.bin", query)
+    for rank, (score, (rel_path, start, end, kind, name)) in enumerate(results[:top], 1):
+        print(f"  {rank:>2}. {rel_path}:{start}-{end}  {kind} {name}  ({score:.2f})")
+    print(f"[+] {min(top, len(results))} of {len(results)} matching chunk(s) shown; {reread} file(s) re-indexed")
+    return 0 if results else 1
+
+def run_semantic_search(query: str, is_regex: bool = False, ignore_case: bool = False,
+                        native: bool = False, rebuild: bool = False, literal: bool = False,
+                        top: int = TOP_CHUNKS, max_results: int = DEFAULT_MAX_RESULTS,
+                        context: int = 0, timeout: int = DEFAULT_TIMEOUT) -> int:
+    if literal or is_regex:
+        return native_search(Path("."), query, is_regex, ignore_case, rebuild, max_results, context)
+    if native or not check_osgrep():
+        if not native:
+            print("[!] osgrep is not installed. Install it with: npm install -g osgrep")
+            print(f"[!] Falling back to the native ranked index for: {query}")
+        return ranked_search(Path("."), query, top, rebuild)
 
     # osgrep available
     try:
-        result = subprocess.run(
-            ["osgrep", "search", query],
-            capture_output=True, text=True, timeout=30
-        )
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr, file=sys.stderr)
-        return result.returncode
-    except subprocess.TimeoutExpired:
-        print("[x] osgrep search timed out after 30s")
-        return 1
+        returncode = stream_osgrep(query, max_results, timeout)
     except FileNotFoundError:
         print("[x] osgrep not found in PATH")
         return 1
+    if returncode is None:
+        print(f"[x] osgrep search timed out after {timeout}s, answering from the native ranked index")
+        return ranked_search(Path("."), query, top, rebuild)
+    return returncode
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python semantic-scan.py <query>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Dasa Dwipa: semantic code search (osgrep, or native ranked/trigram indexes)")
+    parser.add_argument("query", nargs="+", help="Search query")
+    parser.add_argument("--literal", "-F", action="store_true", help="Find the exact text via the trigram index")
+    parser.add_argument("--regex", "-E", action="store_true", help="Find a regular expression via the trigram index")
+    parser.add_argument("--ignore-case", "-i", action="store_true", help="Case-insensitive --literal/--regex matching")
+    parser.add_argument("--native", action="store_true", help="Use the native ranked index even when osgrep is installed")
+    parser.add_argument("--top", type=int, default=TOP_CHUNKS, help=f"Ranked chunks to show (default: {TOP_CHUNKS})")
+    parser.add_argument("--max-results", type=int, default=DEFAULT_MAX_RESULTS,
+                        help=f"Stop after this many matches / osgrep lines (default: {DEFAULT_MAX_RESULTS})")
+    parser.add_argument("--context", "-C", type=int, default=0, help="Lines of context around --literal/--regex matches")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds to wait for osgrep before using the native index (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--rebuild", action="store_true", help="Discard the index and re-index every file")
+    args = parser.parse_args()
 
-    query = " ".join(sys.argv[1:])
+    query = " ".join(args.query)
     print(f"[+] Semantic search: {query}")
-    sys.exit(run_semantic_search(query))
+    sys.exit(run_semantic_search(query, args.regex, args.ignore_case, args.native, args.rebuild, args.literal, args.top,
+                                 args.max_results, max(0, args.context), args.timeout))
@@ -3,87 +3,363 @@
 Dasa Dwipa: The Local Skill Indexer (skill_search.py)
 A zero-dependency semantic search to find skills locally without any cloud services.
 Scans both `.agent/skills/` and `~/.gemini/antigravity/skills/`.
+
+Skills are kept in a BM25 inverted index at `.artifacts/cache/skill_index.json`.
+Only SKILL.md files whose mtime changed are re-read, and only up to the end of
+their frontmatter; a query on an unchanged tree opens just the index.
+
+`--passages` searches skill bodies and their knowledge/reference files instead,
+split by heading into passages and ranked by TF-IDF, printing file, heading and
+line range for the top matches.
 """
 
 import sys
 import os
 import re
+import json
+import math
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import tfidf_vectors  # noqa: E402
+
+INDEX_VERSION = "1"
+INDEX_PATH = Path(".artifacts") / "cache" / "skill_index.json"
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Skill names are short and precise, so their terms count more than description terms
+NAME_WEIGHT = 3
+# Skills may sit in grouping folders (skills/<group>/<skill>/SKILL.md) up to this depth
+MAX_SKILL_DEPTH = 3
+PASSAGE_MANIFEST_PATH = Path(".artifacts") / "cache" / "skill_passages.json"
+PASSAGE_VECTORS_PATH = Path(".artifacts") / "cache" / "skill_passages.bin"
+# Long sections are cut into passages of at most this many lines
+MAX_PASSAGE_LINES = 60
+# Sections shorter than this (non-blank lines) are merged into their first subsection
+MIN_PASSAGE_LINES = 4
+PREVIEW_CHARS = 600
+HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "the", "this", "to", "use", "when", "with", "asked",
+}
+# Longest suffixes first; a stem keeps at least three characters
+SUFFIXES = (
+    ("ational", "ate"), ("ization", "ize"), ("fulness", "ful"), ("iveness", "ive"),
+    ("ations", "ate"), ("ation", "ate"), ("ments", ""), ("ment", ""), ("ness", ""),
+    ("ings", ""), ("ing", ""), ("ies", "y"), ("ied", "y"), ("edly", ""), ("ed", ""),
+    ("ly", ""), ("es", ""), ("s", ""),
+)
+
 def extract_yaml_frontmatter(content):
     match = re.search(r"^---\n(.*?)\n---", content, re.DOTALL)
     if not match:
         return {}
-    
+
     yaml_text = match.group(1)
     metadata = {}
+    key = None
     for line in yaml_text.split("\n"):
-        if ":" in line:
+        if key and line[:1] in (" ", "\t"):
+            # Continuation of a `|`/`>` block scalar or a `- item` list
+            item = line.strip()
+            item = item[2:] if item.startswith("- ") else item
+            metadata[key] = (metadata[key] + " " + item).strip()
+        elif ":" in line:
             key, val = line.split(":", 1)
-            metadata[key.strip()] = val.strip().strip("'\"")
+            key = key.strip()
+            val = val.strip()
+            metadata[key] = "" if val in ("|", ">", "|-", ">-") else val.strip("'\"")
     return metadata
 
-def parse_skills_in_directory(dir_path: Path):
-    skills = []
-    if not dir_path.exists() or not dir_path.is_dir():
-        return skills
-    
-    for root, _, files in os.walk(dir_path):
-        for file in files:
-            if file == "SKILL.md":
-                skill_path = Path(root) / file
-                try:
-                    content = skill_path.read_text(encoding="utf-8")
-                    meta = extract_yaml_frontmatter(content)
-                    if "name" in meta and "description" in meta:
-                        skills.append({
-                            "name": meta["name"],
-                            "description": meta["description"],
-                            "path": str(skill_path.parent)
-                        })
-                except Exception:
-                    pass
-    return skills
-
-def score_skill(skill, query_words):
-    text_corpus = (skill["name"] + " " + skill["description"]).lower()
-    score = 0
-    for word in query_words:
-        if word in text_corpus:
-            score += 1
-    return score
+def stem(word):
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) + len(replacement) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                return word
+            return word[: len(word) - len(suffix)] + replacement
+    return word
+
+def tokenize(text):
+    return [stem(word) for word in re.findall(r"\w+", text.lower()) if word not in STOPWORDS]
+
+def read_frontmatter(skill_path: Path):
+    """Parses SKILL.md frontmatter, reading the file only up to the closing `---`."""
+    lines = ["---\n"]
+    with open(skill_path, encoding="utf-8") as f:
+        if f.readline().rstrip("\r\n") != "---":
+            return {}
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line == "---":
+                return extract_yaml_frontmatter("".join(lines) + "\n---")
+            lines.append(line + "\n")
+    return {}
+
+def skill_files(dirs):
+    """
+    Yields (SKILL.md path, mtime_ns) for every skill under the given roots using
+    directory listings only. A folder holding SKILL.md is a skill and its knowledge
+    subtree is never entered; other folders are searched as groupings.
+    """
+    pending = [(str(dir_path), 1) for dir_path in reversed(dirs)]
+    while pending:
+        dir_path, depth = pending.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted((entry for entry in it if entry.is_dir() and not entry.name.startswith(".")),
+                                 key=lambda entry: entry.name)
+        except OSError:
+            continue
+        groupings = []
+        for entry in entries:
+            skill_path = os.path.join(entry.path, "SKILL.md")
+            try:
+                mtime_ns = os.stat(skill_path).st_mtime_ns
+            except FileNotFoundError:
+                if depth < MAX_SKILL_DEPTH:
+                    groupings.append((entry.path, depth + 1))
+                continue
+            except OSError:
+                continue
+            yield Path(skill_path), mtime_ns
+        pending.extend(reversed(groupings))
+
+def index_skill(skill_path: Path, mtime_ns: int):
+    """Reads one SKILL.md's frontmatter into an index document, or None when it lacks name/description."""
+    try:
+        meta = read_frontmatter(skill_path)
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not meta.get("name") or not meta.get("description"):
+        return None
+    terms = {}
+    for term in tokenize(meta["name"].replace("-", " ")) * NAME_WEIGHT:
+        terms[term] = terms.get(term, 0) + 1
+    for term in tokenize(meta["description"] + " " + meta.get("triggers", "")):
+        terms[term] = terms.get(term, 0) + 1
+    return {
+        "mtime_ns": mtime_ns,
+        "name": meta["name"],
+        "description": meta["description"],
+        "path": str(skill_path.parent),
+        "terms": terms,
+        "length": sum(terms.values()),
+    }
+
+def load_index(index_path: Path):
+    try:
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+        if data.get("version") == INDEX_VERSION:
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": INDEX_VERSION, "docs": {}, "postings": {}, "avgdl": 0}
+
+def save_index(index_path: Path, index):
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, index_path)
+
+def build_postings(docs):
+    """Inverts per-skill term counts into term -> [[skill key, tf], ...]."""
+    postings = {}
+    for key, doc in docs.items():
+        for term, tf in doc["terms"].items():
+            postings.setdefault(term, []).append([key, tf])
+    return postings
+
+def refresh_index(index, dirs, rebuild=False):
+    """
+    Re-reads only SKILL.md files that are new or whose mtime changed, drops skills
+    that disappeared, and rebuilds postings when anything moved. Returns the number
+    of skills re-read (0 means the stored index was already current).
+    """
+    old_docs = {} if rebuild else index["docs"]
+    docs = {}
+    reread = 0
+    for skill_path, mtime_ns in skill_files(dirs):
+        key = str(skill_path)
+        doc = old_docs.get(key)
+        if doc is None or doc["mtime_ns"] != mtime_ns:
+            doc = index_skill(skill_path, mtime_ns)
+            reread += 1
+            if doc is None:
+                continue
+        docs[key] = doc
+    if reread or docs.keys() != index["docs"].keys():
+        index["docs"] = docs
+        index["postings"] = build_postings(docs)
+        index["avgdl"] = sum(doc["length"] for doc in docs.values()) / len(docs) if docs else 0
+        reread = reread or 1
+    return reread
+
+def bm25_search(index, query):
+    """Ranks skills against the query using only the stored postings."""
+    docs = index["docs"]
+    total = len(docs)
+    scores = {}
+    for term in set(tokenize(query)):
+        postings = index["postings"].get(term)
+        if not postings:
+            continue
+        idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+        for key, tf in postings:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * docs[key]["length"] / (index["avgdl"] or 1))
+            scores[key] = scores.get(key, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+    return sorted(((score, docs[key]) for key, score in scores.items()), key=lambda item: (-item[0], item[1]["name"]))
+
+def passage_files(dirs):
+    """Yields (markdown path, mtime_ns) for every skill body and knowledge/reference file."""
+    for dir_path in dirs:
+        if not dir_path.is_dir():
+            continue
+        for root, dirnames, files in os.walk(dir_path):
+            dirnames.sort()
+            for name in sorted(files):
+                if name.endswith(".md"):
+                    path = Path(root) / name
+                    try:
+                        yield path, path.stat().st_mtime_ns
+                    except OSError:
+                        pass
+
+def split_passages(content):
+    """
+    Splits markdown at headings outside code fences into [heading trail, first line,
+    last line, term counts] passages. Frontmatter is skipped; it is covered by the skill index.
+    """
+    lines = content.split("\n")
+    first = 0
+    if lines and lines[0].strip() == "---":
+        closing = next((i for i in range(1, len(lines)) if lines[i].strip() == "---"), None)
+        first = closing + 1 if closing is not None else 0
+    passages = []
+    trail = []
+    body = []
+    start = first + 1
+    start_trail = ""
+    in_fence = False
+
+    def flush(end):
+        terms = {}
+        for term in tokenize("\n".join(body)):
+            terms[term] = terms.get(term, 0) + 1
+        if terms:
+            passages.append([start_trail, start, end, terms])
+
+    for lineno in range(first + 1, len(lines) + 1):
+        line = lines[lineno - 1]
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line)
+        level = len(match.group(1)) if match else 0
+        stub = match and trail and level > trail[-1][0] and sum(1 for text in body if text.strip()) < MIN_PASSAGE_LINES
+        if (match and not stub) or len(body) >= MAX_PASSAGE_LINES:
+            flush(lineno - 1)
+            body = []
+            start = lineno
+        if match:
+            while trail and trail[-1][0] >= level:
+                trail.pop()
+            trail.append((level, match.group(2)))
+        if not body:
+            start_trail = " > ".join(title for _, title in trail)
+        body.append(line)
+    flush(len(lines))
+    return passages
+
+def refresh_passages(manifest_path: Path, vectors_path: Path, dirs, rebuild=False):
+    """Re-splits only markdown files whose mtime changed, then repacks the vectors if anything moved."""
+    manifest = {} if rebuild else load_index(manifest_path).get("files", {})
+    files = {}
+    changed = 0
+    for path, mtime_ns in passage_files(dirs):
+        key = str(path)
+        entry = manifest.get(key)
+        if entry is None or entry["mtime_ns"] != mtime_ns:
+            try:
+                content = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+            entry = {"mtime_ns": mtime_ns, "passages": split_passages(content)}
+            changed += 1
+        files[key] = entry
+    if changed or files.keys() != manifest.keys() or not vectors_path.exists():
+        save_index(manifest_path, {"version": INDEX_VERSION, "files": files})
+        docs = (([path, trail, start, end], terms) for path in sorted(files)
+                for trail, start, end, terms in files[path]["passages"])
+        tfidf_vectors.save_vectors(vectors_path, *tfidf_vectors.build_vectors(docs))
+    return changed
+
+def passage_search(vectors_path: Path, query):
+    """Ranks passages by cosine similarity to the query (see tfidf_vectors.py)."""
+    return tfidf_vectors.rank(vectors_path, tokenize(query))
+
+def passage_preview(path, start, end):
+    try:
+        lines = Path(path).read_text(encoding="utf-8").split("\n")[start - 1:end]
+    except (OSError, UnicodeDecodeError):
+        return ""
+    text = "\n".join(line for line in lines if line.strip())
+    return text if len(text) <= PREVIEW_CHARS else text[:PREVIEW_CHARS].rstrip() + " ..."
+
+def display_path(path):
+    try:
+        return str(Path(path).relative_to(os.getcwd()))
+    except ValueError:
+        return path
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: skill_search.py <query>")
-        sys.exit(1)
-    
-    query = " ".join(sys.argv[1:]).lower()
-    query_words = set(re.findall(r'\w+', query))
-    
+    parser = argparse.ArgumentParser(description="Dasa Dwipa: rank local skills for a query")
+    parser.add_argument("query", nargs="+", help="Words describing the skill you need")
+    parser.add_argument("--top", type=int, help="Number of results to show (default: 3 skills, 5 passages)")
+    parser.add_argument("--passages", action="store_true",
+                        help="Search skill bodies and knowledge/reference files, returning passages")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the stored index and re-read every file")
+    args = parser.parse_args()
+
+    query = " ".join(args.query).lower()
+
     global_dir = Path.home() / ".gemini" / "antigravity" / "skills"
     local_dir = Path(os.getcwd()) / ".agent" / "skills"
-    
-    all_skills = parse_skills_in_directory(global_dir) + parse_skills_in_directory(local_dir)
-    
-    if not all_skills:
+
+    if args.passages:
+        vectors_path = Path(os.getcwd()) / PASSAGE_VECTORS_PATH
+        refresh_passages(Path(os.getcwd()) / PASSAGE_MANIFEST_PATH, vectors_path, [global_dir, local_dir], args.rebuild)
+        results = passage_search(vectors_path, query)[:args.top or 5]
+        print(f"📚 Dasa Dwipa: Top Passages for '{query}'\n")
+        for score, (path, trail, start, end) in results:
+            print(f"✨ {display_path(path)}:{start}-{end} (Score: {score:.2f})")
+            if trail:
+                print(f"   § {trail}")
+            for line in passage_preview(path, start, end).split("\n"):
+                print(f"   {line}")
+            print()
+        if not results:
+            print("No relevant passages matched your query. Try broadening your terms.")
+        return
+
+    index_path = Path(os.getcwd()) / INDEX_PATH
+    index = load_index(index_path)
+    if refresh_index(index, [global_dir, local_dir], args.rebuild):
+        save_index(index_path, index)
+
+    if not index["docs"]:
         print("No skills found on the local machine.")
         sys.exit(0)
-    
-    for skill in all_skills:
-        skill["score"] = score_skill(skill, query_words)
-    
-    ranked_skills = sorted(all_skills, key=lambda x: x["score"], reverse=True)
-    
+
     print(f"🔍 Dasa Dwipa: Ranked Skills for '{query}'\n")
     found_any = False
-    for skill in ranked_skills[:3]:
-        if skill["score"] > 0:
-            found_any = True
-            print(f"✨ {skill['name']} (Score: {skill['score']})")
-            print(f"   Desc: {skill['description']}")
-            print(f"   Path: {skill['path']}\n")
-            
+    for score, skill in bm25_search(index, query)[:args.top or 3]:
+        found_any = True
+        print(f"✨ {skill['name']} (Score: {score:.2f})")
+        print(f"   Desc: {skill['description']}")
+        print(f"   Path: {skill['path']}\n")
+
     if not found_any:
         print("No relevant skills matched your query. Try broadening your terms.")
 
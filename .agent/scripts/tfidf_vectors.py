@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Dasa Dwipa: Shared TF-IDF Vectors (tfidf_vectors.py)
+The packed vector format behind skill_search.py --passages and semantic-scan.py's
+ranked search, so both build and score documents the same way.
+
+A vectors file is one JSON header line followed by two flat arrays: document ids
+(uint32) and L2-normalized TF-IDF weights (float32), grouped by term. The header
+maps each term to its [offset, count, idf] slice and lists each document's
+metadata under "chunks". Ranking seeks to the slices of the query terms only.
+"""
+
+import os
+import json
+import math
+from array import array
+from pathlib import Path
+
+def build_vectors(docs):
+    """
+    Packs (metadata, term counts) pairs into (header, ids, weights). Document ids
+    are positions in `docs`; the header's "chunks" list holds their metadata.
+    """
+    metas = []
+    term_ids = {}
+    postings = []
+    for meta, counts in docs:
+        doc_id = len(metas)
+        metas.append(meta)
+        for term, tf in counts.items():
+            term_id = term_ids.setdefault(term, len(term_ids))
+            if term_id == len(postings):
+                postings.append([])
+            postings[term_id].append((doc_id, tf))
+
+    idf = [math.log((1 + len(metas)) / (1 + len(plist))) + 1 for plist in postings]
+    norms = [0.0] * len(metas)
+    for term_id, plist in enumerate(postings):
+        for doc_id, tf in plist:
+            norms[doc_id] += ((1 + math.log(tf)) * idf[term_id]) ** 2
+
+    ids = array("I")
+    weights = array("f")
+    vocab = {}
+    for term, term_id in term_ids.items():
+        vocab[term] = [len(ids), len(postings[term_id]), idf[term_id]]
+        for doc_id, tf in postings[term_id]:
+            ids.append(doc_id)
+            weights.append((1 + math.log(tf)) * idf[term_id] / math.sqrt(norms[doc_id]))
+    return {"chunks": metas, "vocab": vocab, "total": len(ids)}, ids, weights
+
+def save_vectors(vectors_path: Path, header, ids, weights):
+    vectors_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = vectors_path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+        ids.tofile(f)
+        weights.tofile(f)
+    os.replace(tmp_path, vectors_path)
+
+def rank(vectors_path: Path, terms):
+    """
+    Scores documents by cosine similarity to the query terms, reading only their
+    posting slices. Returns (score, metadata) pairs, best first.
+    """
+    counts = {}
+    for term in terms:
+        counts[term] = counts.get(term, 0) + 1
+    with open(vectors_path, "rb") as f:
+        header = json.loads(f.readline())
+        base = f.tell()
+        scores = {}
+        norm = 0.0
+        for term, tf in counts.items():
+            slot = header["vocab"].get(term)
+            if not slot:
+                continue
+            offset, count, idf = slot
+            ids = array("I")
+            weights = array("f")
+            f.seek(base + offset * ids.itemsize)
+            ids.fromfile(f, count)
+            f.seek(base + header["total"] * ids.itemsize + offset * weights.itemsize)
+            weights.fromfile(f, count)
+            query_weight = (1 + math.log(tf)) * idf
+            norm += query_weight ** 2
+            for doc_id, weight in zip(ids, weights):
+                scores[doc_id] = scores.get(doc_id, 0.0) + query_weight * weight
+    norm = math.sqrt(norm) or 1.0
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [(score / norm, header["chunks"][doc_id]) for doc_id, score in ranked]
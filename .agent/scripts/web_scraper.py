@@ -4,82 +4,653 @@ Dasa Widya: The Extractor (web_scraper.py)
 Natively fetches URL content and strips all HTML, inline CSS, and JavaScript.
 Outputs pure markdown text to prevent massive token waste when Widya researchers.
 Zero extra dependencies required.
+
+Pages are converted by a streaming html.parser extractor fed straight from the
+socket in chunks: script/style subtrees are skipped, headings, list items and
+code blocks come out as markdown, and reading stops as soon as the extraction
+exceeds its 15,000-char budget.
+
+Several URLs (as arguments or one per line in `--file`) are fetched concurrently
+by a bounded thread pool. Each host gets a small pool of keep-alive connections
+and requests to it are spaced by `--interval` seconds. Every page is written to
+`.artifacts/research/<name>.toon`, listed in `.artifacts/research/index.toon`.
+
+Responses are cached in `.artifacts/cache/web/` (extracted text and
+ETag/Last-Modified per URL). Fresh entries (Cache-Control max-age, else one day)
+are served without touching the network; stale ones are revalidated with a
+conditional request and reused on 304. The least recently used entries are
+evicted once the cache outgrows its size cap.
+
+Usage:
+  python .agent/scripts/web_scraper.py <URL>
+  python .agent/scripts/web_scraper.py <URL> <URL> ... [--file urls.txt] [--workers 8]
+  python .agent/scripts/web_scraper.py <URL> --refresh    (revalidate even fresh cache entries)
 """
 
-import urllib.request
+import os
 import re
 import sys
+import json
+import time
+import hashlib
+import argparse
+import codecs
+import threading
+import html.parser
+import http.client
+import urllib.error
+import urllib.parse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+TIMEOUT = 10
+# Roughly 15,000 chars keeps an extraction from blowing out the context
+MAX_CHARS = 15000
+# Response bytes handed to the extractor per read
+CHUNK_BYTES = 64 * 1024
+# Subtrees whose text is never content
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "canvas"}
+BLOCK_TAGS = {
+    "p", "div", "br", "hr", "section", "article", "main", "aside", "header", "footer", "nav",
+    "table", "tr", "ul", "ol", "dl", "dt", "dd", "blockquote", "figure", "figcaption", "form", "title",
+}
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+OUT_PATH = Path(".artifacts") / "research_extraction.toon"
+BATCH_DIR = Path(".artifacts") / "research"
+INDEX_NAME = "index.toon"
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+DEFAULT_WORKERS = 8
+# Connections kept open per host, and the gap between two request starts to it (seconds)
+DEFAULT_PER_HOST = 2
+DEFAULT_INTERVAL = 0.5
+CACHE_VERSION = "2"
+CACHE_DIR = Path(".artifacts") / "cache" / "web"
+# Responses without Cache-Control max-age are served for this long before revalidation
+DEFAULT_TTL = 24 * 3600
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+class HostClient:
+    """
+    Keep-alive connections to one scheme://host. At most `max_conns` requests are
+    in flight at once and request starts are spaced by `interval` seconds.
+    """
+
+    def __init__(self, scheme, netloc, max_conns, interval, timeout=TIMEOUT):
+        self.conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        self.netloc = netloc
+        self.timeout = timeout
+        self.interval = interval
+        self.slots = threading.BoundedSemaphore(max_conns)
+        self.lock = threading.Lock()
+        self.idle = []
+        self.next_start = 0.0
+
+    def wait_turn(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def get(self, target, headers, reader=None):
+        """
+        Sends a GET over an idle connection (or a new one). Returns (status, reason,
+        headers, body). A successful body is streamed into `reader` when given (and
+        `body` is then b""); if the reader stops early, the connection is closed
+        instead of being reused.
+        """
+        with self.slots:
+            with self.lock:
+                conn = self.idle.pop() if self.idle else None
+            while True:
+                reused = conn is not None
+                if conn is None:
+                    conn = self.conn_class(self.netloc, timeout=self.timeout)
+                self.wait_turn()
+                try:
+                    conn.request("GET", target, headers=headers)
+                    response = conn.getresponse()
+                    if reader is None or not 200 <= response.status < 300:
+                        body = response.read()
+                    else:
+                        body = b""
+                        stream_body(response, reader)
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    conn.close()
+                    conn = None
+                    if reused:
+                        continue  # the server dropped an idle connection; retry once on a fresh one
+                    raise
+                except Exception:
+                    conn.close()
+                    raise
+                break
+            if response.isclosed():
+                with self.lock:
+                    self.idle.append(conn)
+            else:
+                conn.close()  # unread body left on the socket
+            return response.status, response.reason, response.headers, body
+
+    def close(self):
+        with self.lock:
+            for conn in self.idle:
+                conn.close()
+            self.idle = []
 
-def fetch_html(url):
-    """Fetch raw HTML from a URL."""
+def stream_body(response, reader):
+    """
+    Feeds a response to reader.feed() chunk by chunk until it ends or the reader
+    has enough; nothing is kept, so memory stays bounded by the extraction.
+    """
+    reader.start(response.headers)
+    while True:
+        chunk = response.read(CHUNK_BYTES)
+        if not chunk or not reader.feed(chunk):
+            break
+
+class Fetcher:
+    """Shares one HostClient per scheme://host between all threads and follows redirects."""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, interval=DEFAULT_INTERVAL, timeout=TIMEOUT):
+        self.per_host = per_host
+        self.interval = interval
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.clients = {}
+
+    def client(self, scheme, netloc):
+        with self.lock:
+            client = self.clients.get((scheme, netloc))
+            if client is None:
+                client = HostClient(scheme, netloc, self.per_host, self.interval, self.timeout)
+                self.clients[(scheme, netloc)] = client
+            return client
+
+    def get(self, url, extra_headers=None, reader=None):
+        """
+        Returns (final url, status, headers, body); raises HTTPError for 4xx/5xx like
+        urlopen. The final page's body is streamed into `reader` when given.
+        """
+        headers = {"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml,*/*;q=0.8"}
+        headers.update(extra_headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.netloc:
+                raise ValueError(f"unsupported URL: {url}")
+            target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+            status, reason, response_headers, body = self.client(parts.scheme, parts.netloc).get(target, headers, reader)
+            if status in REDIRECT_STATUSES and response_headers.get("Location"):
+                url = urllib.parse.urljoin(url, response_headers["Location"])
+                continue
+            if status >= 400:
+                raise urllib.error.HTTPError(url, status, reason, response_headers, None)
+            return url, status, response_headers, body
+        raise urllib.error.URLError(f"more than {MAX_REDIRECTS} redirects")
+
+    def close(self):
+        with self.lock:
+            for client in self.clients.values():
+                client.close()
+
+def decode_body(body, charset):
     try:
-        req = urllib.request.Request(
-            url, 
-            data=None, 
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-        )
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return response.read().decode('utf-8', errors='ignore')
+        return body.decode(charset or 'utf-8', errors='ignore')
+    except LookupError:
+        return body.decode('utf-8', errors='ignore')  # unknown charset label
+
+def fetch_html(url, fetcher=None):
+    """Fetch raw HTML from a URL, over `fetcher`'s pooled connections when given."""
+    own = fetcher is None
+    if own:
+        fetcher = Fetcher(per_host=1, interval=0)
+    try:
+        _final_url, _status, headers, body = fetcher.get(url)
+        return decode_body(body, headers.get_content_charset())
     except Exception as e:
         print(f"🔴 [Widya Extractor] Error fetching {url}: {e}")
         return None
+    finally:
+        if own:
+            fetcher.close()
+
+class TextExtractor(html.parser.HTMLParser):
+    """
+    Incremental HTML-to-markdown converter. Text is gathered per block; headings
+    become `#` lines, list items `-`/`1.` lines and <pre> fenced code. Once the
+    output passes `budget` chars, `done` is set and further input is ignored, so
+    `done` also tells that the text was truncated.
+    """
+
+    def __init__(self, budget=None):
+        super().__init__(convert_charrefs=True)
+        self.budget = budget
+        self.blocks = []
+        self.chars = 0
+        self.done = False
+        self.parts = []
+        self.pending = 0  # chars buffered in parts for the open block
+        self.prefix = ""
+        self.skip = 0
+        self.lists = []  # one [ordered, next number] per open list
+        self.pre = None  # fence language while inside <pre>
+        self.code = False
+        self.last_item = False
+
+    def feed(self, data):
+        if self.done:
+            return
+        if self.skip and self.cdata_elem:
+            # Inside <script>/<style> HTMLParser buffers everything until the closing tag
+            # and rescans it on every feed; while that tag has not arrived, keep only
+            # enough of the (ignored) text to catch one split across chunks.
+            close = "</" + self.cdata_elem
+            tail = self.rawdata[-len(close):] + data
+            if close not in tail.lower():
+                self.rawdata = tail[-len(close):]
+                return
+        super().feed(data)
+
+    def flush(self):
+        if self.pre is not None:
+            text = "".join(self.parts).strip("\n")
+            block = f"```{self.pre}\n{text}\n```" if text.strip() else ""
+        else:
+            text = re.sub(r"\s+", " ", "".join(self.parts)).strip()
+            block = self.prefix + text if text else ""
+        item = self.pre is None and bool(self.lists) and bool(self.prefix)
+        self.parts = []
+        self.pending = 0
+        self.prefix = ""
+        if block and not self.done:
+            if item and self.last_item:
+                self.blocks[-1] += "\n" + block  # consecutive items form one tight list
+            else:
+                self.blocks.append(block)
+            self.last_item = item
+            self.chars += len(block) + 2
+            if self.budget is not None and self.chars > self.budget:
+                self.done = True
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip or tag in SKIP_TAGS:
+            if tag in SKIP_TAGS:
+                self.skip += 1
+            return
+        if self.pre is not None:
+            if tag == "code" and not self.pre:
+                self.pre = language_of(attrs)
+            return
+        if tag == "pre":
+            self.flush()
+            self.pre = language_of(attrs)
+        elif tag in HEADING_TAGS:
+            self.flush()
+            self.prefix = "#" * HEADING_TAGS[tag] + " "
+        elif tag in ("ul", "ol"):
+            self.flush()
+            self.lists.append([tag == "ol", 1])
+        elif tag == "li":
+            self.flush()
+            indent = "  " * max(0, len(self.lists) - 1)
+            if self.lists and self.lists[-1][0]:
+                self.prefix = f"{indent}{self.lists[-1][1]}. "
+                self.lists[-1][1] += 1
+            else:
+                self.prefix = f"{indent}- "
+        elif tag in BLOCK_TAGS:
+            self.flush()
+        elif tag == "code":
+            self.code = True
+            self.parts.append("`")
+        elif tag in ("td", "th"):
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if self.skip:
+            if tag in SKIP_TAGS:
+                self.skip -= 1
+            return
+        if self.pre is not None:
+            if tag == "pre":
+                self.flush()
+                self.pre = None
+            return
+        if tag in ("ul", "ol"):
+            self.flush()
+            if self.lists:
+                self.lists.pop()
+            if not self.lists:
+                self.last_item = False
+        elif tag == "code" and self.code:
+            self.code = False
+            self.parts.append("`")
+        elif tag in HEADING_TAGS or tag == "li" or tag in BLOCK_TAGS:
+            self.flush()
+
+    def handle_data(self, data):
+        if self.skip or self.done:
+            return
+        self.parts.append(data)
+        self.pending += len(data)
+        if self.budget is not None:
+            # A single huge block never reaches flush() on its own; cut it at the budget.
+            over = self.chars + len(self.prefix) + self.pending - self.budget
+            if over > 0:
+                self.parts[-1] = data[:max(0, len(data) - over)]
+                self.flush()
+                self.done = True
+
+    def text(self):
+        self.flush()
+        return "\n\n".join(self.blocks)
+
+def language_of(attrs):
+    """Fence language from a `language-xx`/`lang-xx` class, or ""."""
+    for name, value in attrs:
+        if name == "class" and value:
+            match = re.search(r"\b(?:language|lang)-([\w+#-]+)", value)
+            if match:
+                return match.group(1)
+    return ""
+
+class PageReader:
+    """Decodes response chunks as they arrive and feeds them to a TextExtractor."""
+
+    def __init__(self, budget=MAX_CHARS):
+        self.extractor = TextExtractor(budget)
+        self.decoder = None
+
+    def start(self, headers):
+        try:
+            self.decoder = codecs.getincrementaldecoder(headers.get_content_charset() or 'utf-8')(errors='ignore')
+        except LookupError:
+            self.decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')  # unknown charset label
+
+    def feed(self, chunk):
+        """Returns False once the extraction has its budget and no more input is needed."""
+        self.extractor.feed(self.decoder.decode(chunk))
+        return not self.extractor.done
+
+    @property
+    def truncated(self):
+        return self.extractor.done
+
+    def text(self):
+        if not self.extractor.done:
+            self.extractor.feed(self.decoder.decode(b"", final=True))
+            self.extractor.close()
+        return self.extractor.text()
 
 def extract_text(html):
-    """Strip all HTML tags and noise, returning clean text."""
+    """Strip all HTML tags and noise, returning clean markdown text."""
     if not html:
         return ""
-        
-    # 1. Remove script and style blocks completely
-    text = re.sub(r'<script.*?</script>', '', html, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r'<style.*?</style>', '', text, flags=re.IGNORECASE | re.DOTALL)
-    
-    # 2. Replace common block elements with newlines for formatting
-    text = re.sub(r'</?(p|div|br|h[1-6]|li|tr|table|ul|ol|header|footer|nav)[^>]*>', '\n', text, flags=re.IGNORECASE)
-    
-    # 3. Strip all remaining HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # 4. Clean up whitespace and empty lines
-    lines = [line.strip() for line in text.split('\n')]
-    cleaned_lines = [line for line in lines if line]
-    
-    return '\n\n'.join(cleaned_lines)
+    extractor = TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+def freshness(headers):
+    """Seconds a response may be served without revalidation, or None when it must not be stored."""
+    directives = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('" ')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    try:
+        return max(0, int(directives["max-age"]))
+    except (KeyError, ValueError):
+        return DEFAULT_TTL
+
+class WebCache:
+    """
+    Extracted text keyed by URL, plus an index.json holding each entry's validators,
+    expiry, truncation flag, size and last access. Shared by all fetch threads;
+    eviction (least recently used first) and the index write happen in save().
+    """
+
+    def __init__(self, root: Path = CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.dirty = False
+        try:
+            data = json.loads((root / "index.json").read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data["entries"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def lookup(self, url):
+        """The entry for a URL (marking it as used), or None."""
+        with self.lock:
+            entry = self.entries.get(self.key(url))
+            if entry is not None:
+                entry["accessed"] = time.time()
+                self.dirty = True
+            return entry
+
+    def read_text(self, url):
+        try:
+            return (self.root / f"{self.key(url)}.txt").read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _write(self, path: Path, data: bytes):
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def store(self, url, headers, text, truncated=False):
+        ttl = freshness(headers)
+        if ttl is None:
+            return
+        key = self.key(url)
+        encoded = text.encode("utf-8")
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Each thread works on its own URL, so only the index needs the lock
+        self._write(self.root / f"{key}.txt", encoded)
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {
+                "url": url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "truncated": truncated,
+                "expires": now + ttl,
+                "accessed": now,
+                "size": len(encoded),
+            }
+            self.dirty = True
+
+    def revalidated(self, url, headers):
+        """Extends an entry after a 304, taking any validators the server sent along."""
+        ttl = freshness(headers)
+        with self.lock:
+            entry = self.entries[self.key(url)]
+            entry["expires"] = time.time() + (ttl or 0)
+            entry["etag"] = headers.get("ETag") or entry["etag"]
+            entry["last_modified"] = headers.get("Last-Modified") or entry["last_modified"]
+            self.dirty = True
+
+    def drop(self, url):
+        with self.lock:
+            if self.entries.pop(self.key(url), None) is not None:
+                self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        total = sum(entry["size"] for entry in self.entries.values())
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["accessed"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self.root / f"{key}.txt")
+            except OSError:
+                pass
+            del self.entries[key]
+            total -= entry["size"]
+        self.root.mkdir(parents=True, exist_ok=True)
+        data = {"version": CACHE_VERSION, "entries": self.entries}
+        self._write(self.root / "index.json", json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        self.dirty = False
+
+def extract_url(url, fetcher, cache=None, refresh=False):
+    """
+    Clean text for a URL, where it came from ("cache" for fresh with no request,
+    "304" for revalidated or "network") and whether the extraction stopped at its
+    budget. Returns (None, "error", False) when the fetch fails.
+    """
+    entry = cache.lookup(url) if cache else None
+    if entry and not refresh and time.time() < entry["expires"]:
+        text = cache.read_text(url)
+        if text is not None:
+            return text, "cache", entry.get("truncated", False)
+    conditional = {}
+    if entry and entry.get("etag"):
+        conditional["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        conditional["If-Modified-Since"] = entry["last_modified"]
+    reader = PageReader()
+    try:
+        _final_url, status, headers, _body = fetcher.get(url, conditional, reader)
+    except Exception as e:
+        print(f"🔴 [Widya Extractor] Error fetching {url}: {e}")
+        return None, "error", False
+    if status == 304 and entry:
+        text = cache.read_text(url)
+        if text is not None:
+            cache.revalidated(url, headers)
+            return text, "304", entry.get("truncated", False)
+        cache.drop(url)
+        return extract_url(url, fetcher, cache, refresh)  # the stored text is gone; fetch it whole
+    text = reader.text()
+    if cache:
+        cache.store(url, headers, text, reader.truncated)
+    return text, "network", reader.truncated
+
+def write_extraction(out_path: Path, clean_text, truncated=False):
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w") as f:
+        content = clean_text[:MAX_CHARS]
+        if truncated or len(clean_text) > MAX_CHARS:
+             content += "\n\n... [CONTENT TRUNCATED FOR TOKEN SAFETY] ..."
+        f.write(content)
+
+def normalize_url(url):
+    # Basic validation
+    return url if url.startswith('http') else 'https://' + url
+
+def load_urls(urls, url_file=None):
+    """URLs from the arguments then the file (one per line, `#` comments), deduplicated in order."""
+    if url_file:
+        with open(url_file, encoding="utf-8") as f:
+            urls = list(urls) + [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    return list(dict.fromkeys(normalize_url(url) for url in urls))
+
+def output_name(url):
+    """A readable, collision-free file name for a URL's extraction."""
+    parts = urllib.parse.urlsplit(url)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", parts.netloc + parts.path).strip("-")[:80]
+    return f"{slug}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}.toon"
+
+def extract_one(url, fetcher, cache, refresh, out_dir: Path):
+    """Fetches and extracts one URL of a batch. Returns its index row (url, file, chars, status, source)."""
+    clean_text, source, truncated = extract_url(url, fetcher, cache, refresh)
+    if clean_text is None:
+        return url, "-", 0, "error", source
+    name = output_name(url)
+    write_extraction(out_dir / name, clean_text, truncated)
+    return url, name, len(clean_text), "ok", source
+
+def write_index(rows, out_dir: Path, elapsed):
+    lines = [
+        "# Widya Research Index",
+        f"URLs: {len(rows)}",
+        f"Fetched: {sum(1 for row in rows if row[3] == 'ok')}",
+        f"From cache: {sum(1 for row in rows if row[4] in ('cache', '304'))}",
+        f"Elapsed: {elapsed:.1f} s",
+        "",
+        "status | source | chars | file | url",
+    ]
+    for url, name, chars, status, source in rows:
+        lines.append(f"{status} | {source} | {chars} | {name} | {url}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / INDEX_NAME).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+def run_batch(urls, workers, per_host, interval, cache, refresh):
+    print(f"🛡️  [Dasa Widya] Extracting clean text from {len(urls)} URLs ({workers} workers)")
+    started = time.monotonic()
+    fetcher = Fetcher(per_host=per_host, interval=interval)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(lambda url: extract_one(url, fetcher, cache, refresh, BATCH_DIR), urls))
+    finally:
+        fetcher.close()
+        if cache:
+            cache.save()
+    write_index(rows, BATCH_DIR, time.monotonic() - started)
+    ok = sum(1 for row in rows if row[3] == "ok")
+    print(f"🟢 [Widya Extractor] Stripped {ok}/{len(rows)} pages in {time.monotonic() - started:.1f}s.")
+    print(f"Index saved to {BATCH_DIR / INDEX_NAME}")
+    sys.exit(0 if ok else 1)
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 web_scraper.py <URL>")
+    parser = argparse.ArgumentParser(description="Dasa Widya: extract clean text from web pages")
+    parser.add_argument("urls", nargs="*", help="URLs to extract")
+    parser.add_argument("--file", "-f", help="File with one URL per line")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Pages fetched concurrently (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help=f"Keep-alive connections per host (default: {DEFAULT_PER_HOST})")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"Seconds between requests to the same host (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--refresh", action="store_true", help="Revalidate cached pages even when still fresh")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the page cache")
+    args = parser.parse_args()
+
+    urls = load_urls(args.urls, args.file)
+    if not urls:
+        print("Usage: python3 web_scraper.py <URL> [<URL> ...] [--file urls.txt]")
         sys.exit(1)
-        
-    url = sys.argv[1]
-    
-    # Basic validation
-    if not url.startswith('http'):
-         url = 'https://' + url
-         
+    cache = None if args.no_cache else WebCache()
+    if len(urls) > 1 or args.file:
+        run_batch(urls, max(1, args.workers), max(1, args.per_host), max(0.0, args.interval), cache, args.refresh)
+
+    url = urls[0]
     print(f"🛡️  [Dasa Widya] Extracting clean text from: {url}")
-    
-    html = fetch_html(url)
-    if not html:
+
+    fetcher = Fetcher(per_host=1, interval=0)
+    try:
+        clean_text, source, truncated = extract_url(url, fetcher, cache, args.refresh)
+    finally:
+        fetcher.close()
+        if cache:
+            cache.save()
+    if clean_text is None:
          sys.exit(1)
-         
-    clean_text = extract_text(html)
-    
-    # Ensure artifacts directory exists
-    import os
-    os.makedirs(".artifacts", exist_ok=True)
-    out_path = ".artifacts/research_extraction.toon"
-    
-    with open(out_path, "w") as f:
-        # Truncate to roughly 15,000 chars to ensure we don't blow out context
-        content = clean_text[:15000]
-        if len(clean_text) > 15000:
-             content += "\n\n... [CONTENT TRUNCATED FOR TOKEN SAFETY] ..."
-        f.write(content)
-        
-    print(f"🟢 [Widya Extractor] Successfully stripped HTML noise.")
-    print(f"Clean markdown saved to {out_path} ({len(clean_text)} chars).")
+
+    write_extraction(OUT_PATH, clean_text, truncated)
+
+    if source == "network":
+        print(f"🟢 [Widya Extractor] Successfully stripped HTML noise.")
+    else:
+        print(f"🟢 [Widya Extractor] Served from cache ({'fresh' if source == 'cache' else 'revalidated, 304'}).")
+    print(f"Clean markdown saved to {OUT_PATH} ({len(clean_text)} chars{', truncated' if truncated else ''}).")
     sys.exit(0)
 
 if __name__ == "__main__":
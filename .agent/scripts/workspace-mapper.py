@@ -6,6 +6,14 @@ Persona: Dasa Dwipa (The Scout)
 Usage:
   python .agent/scripts/workspace-mapper.py
   python .agent/scripts/workspace-mapper.py --depth 3
+  python .agent/scripts/workspace-mapper.py --gitignore --max-entries 20
+
+Directories are listed with os.scandir (one listing per directory, no extra stat
+for type checks) and annotated with file-count/size rollups of their whole
+subtree. Output stays bounded: each directory shows at most --max-entries
+children and the whole map at most --max-total lines, with "... N more" for the rest.
+With --gitignore the tree comes from the shared filesystem snapshot (fs_snapshot.py),
+which lists only files git (or the root .gitignore) does not ignore.
 """
 
 import os
@@ -13,46 +21,138 @@ import sys
 import argparse
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fs_snapshot import snapshot  # noqa: E402
+
 IGNORE_DIRS = {
     ".git", "node_modules", "__pycache__", ".venv", "venv", "vendor",
     ".next", "dist", "build", "coverage", ".cache", "tmp", ".agent",
     "ag-kit", "awesome-antigravity"
 }
+DEFAULT_MAX_ENTRIES = 40
+DEFAULT_MAX_TOTAL = 500
+
+def scan(path: str, depth: int) -> tuple:
+    """
+    Lists one directory and rolls up its subtree. Returns (entries, files, size)
+    where entries are (name, is_dir, size, files, children) sorted directories
+    first; children are kept only while `depth` allows them to be displayed.
+    """
+    try:
+        with os.scandir(path) as it:
+            listing = list(it)
+    except OSError:
+        return [], 0, 0
+
+    entries = []
+    files = 0
+    size = 0
+    for entry in listing:
+        if entry.name in IGNORE_DIRS:
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                children, child_files, child_size = scan(entry.path, depth - 1)
+                entries.append((entry.name, True, child_size, child_files, children if depth > 1 else None))
+            else:
+                child_files, child_size = 1, entry.stat(follow_symlinks=False).st_size
+                entries.append((entry.name, False, child_size, 1, None))
+        except OSError:
+            continue
+        files += child_files
+        size += child_size
+    entries.sort(key=lambda e: (not e[1], e[0].lower()))
+    return entries, files, size
 
-def build_tree(directory: Path, prefix: str = "", depth: int = 3, current_depth: int = 0) -> list[str]:
-    if current_depth >= depth:
-        return []
+def scan_snapshot(directory: Path, depth: int) -> tuple:
+    """Same result as scan(), built from the shared snapshot's non-ignored files instead of the disk."""
+    snap, under = snapshot(directory)
+    tree = {}
+    for rel_path, size, _mtime_ns in snap.iter_files(under):
+        parts = rel_path.split("/")
+        if IGNORE_DIRS.intersection(parts):
+            continue
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = size
 
+    def convert(node: dict, depth: int) -> tuple:
+        entries = []
+        for name, child in node.items():
+            if isinstance(child, dict):
+                children, child_files, child_size = convert(child, depth - 1)
+                entries.append((name, True, child_size, child_files, children if depth > 1 else None))
+            else:
+                entries.append((name, False, child, 1, None))
+        entries.sort(key=lambda e: (not e[1], e[0].lower()))
+        return entries, sum(e[3] for e in entries), sum(e[2] for e in entries)
+
+    return convert(tree, depth)
+
+def human_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def rollup(files: int, size: int) -> str:
+    return f"({files} file{'s' if files != 1 else ''}, {human_size(size)})"
+
+def build_tree(entries: list, prefix: str = "", max_entries: int = DEFAULT_MAX_ENTRIES, budget: list = None) -> list[str]:
+    """
+    Renders scanned entries; `budget` is a one-item list holding the lines still
+    allowed in total. A line stays reserved for the "... N more" summary whenever
+    entries remain after the one being shown, so the summaries fit the budget too.
+    """
+    if budget is None:
+        budget = [DEFAULT_MAX_TOTAL]
     lines = []
-    try:
-        entries = sorted(
-            [e for e in directory.iterdir() if e.name not in IGNORE_DIRS],
-            key=lambda e: (not e.is_dir(), e.name.lower())
-        )
-    except PermissionError:
-        return []
-
-    for i, entry in enumerate(entries):
+    limit = min(len(entries), max_entries)
+    for i, (name, is_dir, size, files, children) in enumerate(entries):
         is_last = i == len(entries) - 1
+        if i >= limit or budget[0] < (1 if is_last else 2):
+            if budget[0] > 0:
+                rest = entries[i:]
+                lines.append(f"{prefix}└── ... {len(rest)} more "
+                             f"{rollup(sum(e[3] for e in rest), sum(e[2] for e in rest))}")
+                budget[0] -= 1
+            break
         connector = "└── " if is_last else "├── "
-        lines.append(f"{prefix}{connector}{entry.name}")
-        if entry.is_dir():
-            extension = "    " if is_last else "│   "
-            lines.extend(build_tree(entry, prefix + extension, depth, current_depth + 1))
+        budget[0] -= 1
+        if is_dir:
+            lines.append(f"{prefix}{connector}{name}/  {rollup(files, size)}")
+            if children:
+                extension = "    " if is_last else "│   "
+                reserve = 0 if is_last else 1
+                budget[0] -= reserve
+                lines.extend(build_tree(children, prefix + extension, max_entries, budget))
+                budget[0] += reserve
+        else:
+            lines.append(f"{prefix}{connector}{name}")
 
     return lines
 
 def main():
     parser = argparse.ArgumentParser(description="Workspace structure map for Dasa Dwipa")
     parser.add_argument("--depth", type=int, default=3, help="Max depth to display (default: 3)")
+    parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f"Children shown per directory (default: {DEFAULT_MAX_ENTRIES})")
+    parser.add_argument("--max-total", type=int, default=DEFAULT_MAX_TOTAL,
+                        help=f"Entries shown in the whole map (default: {DEFAULT_MAX_TOTAL})")
+    parser.add_argument("--gitignore", action="store_true", help="Hide paths ignored by .gitignore")
     args = parser.parse_args()
 
     cwd = Path.cwd()
-    print(f"\n📁 {cwd.name}/")
-    lines = build_tree(cwd, depth=args.depth)
+    if args.gitignore:
+        entries, files, size = scan_snapshot(cwd, args.depth)
+    else:
+        entries, files, size = scan(str(cwd), args.depth)
+    print(f"\n📁 {cwd.name}/  {rollup(files, size)}")
+    lines = build_tree(entries, max_entries=max(1, args.max_entries), budget=[max(1, args.max_total)])
     for line in lines:
         print(line)
-    print(f"\n[+] Scanned {len(lines)} entries (depth: {args.depth})")
+    print(f"\n[+] Scanned {files} files, showing {len(lines)} entries (depth: {args.depth})")
 
 if __name__ == "__main__":
     main()
@@ -80,6 +80,9 @@ function scaffoldGitignore(dest) {
 .artifacts/process_registry.toon
 .artifacts/side-effects.toon
 .artifacts/generated-skills/
+.artifacts/cache/
+.artifacts/symbols.db
+.artifacts/research/
 .artifacts/*-*.toon
 .design-memory/compressed/
 *.webp